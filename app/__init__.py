@@ -7,12 +7,13 @@ def create_app(config_class=Config):
     app.config.from_object(config_class)
 
     # Initialize extensions
-    from app.extensions import db, login_manager, migrate, csrf
+    from app.extensions import db, login_manager, migrate, csrf, cache
     db.init_app(app)
     login_manager.init_app(app)
     login_manager.login_view = 'auth.login'
     migrate.init_app(app, db)
     csrf.init_app(app)
+    cache.init_app(app)
 
     # Register user loader function
     @login_manager.user_loader
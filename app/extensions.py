@@ -2,6 +2,7 @@ from flask_sqlalchemy import SQLAlchemy
 from flask_login import LoginManager
 from flask_migrate import Migrate
 from flask_wtf.csrf import CSRFProtect
+from flask_caching import Cache
 
 # Initialize extensions
 db = SQLAlchemy()
@@ -9,6 +10,7 @@ login_manager = LoginManager()
 login_manager.login_view = 'auth.login'
 login_manager.login_message_category = 'info'
 csrf = CSRFProtect()
+cache = Cache()
 
 # User loader function will be registered in __init__.py to avoid circular imports
 
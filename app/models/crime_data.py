@@ -193,6 +193,8 @@ class CrimeReport(db.Model):
         Index('idx_crime_geom', 'geom', postgresql_using='gist'),
         Index('idx_crime_type', 'crime_type_id'),
         Index('idx_crime_location', 'location_id'),
+        Index('idx_crime_date_day_type', 'date_day', 'crime_type_id'),
+        Index('idx_crime_type_date_day', 'crime_type_id', 'date_day', postgresql_include=['id']),
         {'extend_existing': True}
     )
     
@@ -208,6 +210,9 @@ class CrimeReport(db.Model):
     
     # Incident details
     date_occurred = db.Column(db.DateTime, nullable=False, index=True)
+    # Calendar day of the incident, maintained by the database for day-level grouping;
+    # date() truncates a timestamp on both SQLite and Postgres
+    date_day = db.Column(db.Date, db.Computed('date(date_occurred)', persisted=True))
     date_reported = db.Column(db.DateTime, default=datetime.utcnow, index=True)
     status = db.Column(
         db.String(30),
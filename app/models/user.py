@@ -1,12 +1,17 @@
 from datetime import datetime
 from flask_login import UserMixin
-from werkzeug.security import generate_password_hash, check_password_hash
+from werkzeug.security import check_password_hash
+from argon2 import PasswordHasher
+from argon2.exceptions import InvalidHash, VerificationError
 from flask import current_app
 from itsdangerous import URLSafeTimedSerializer
 
 from app.extensions import db
 from app.utils import generate_confirmation_token, confirm_token
 
+# Argon2id via argon2-cffi's C backend; werkzeug's pbkdf2 loop dominated login time
+password_hasher = PasswordHasher(time_cost=2, memory_cost=64 * 1024, parallelism=2)
+
 
 class User(UserMixin, db.Model):
     __tablename__ = 'users'
@@ -43,11 +48,27 @@ class User(UserMixin, db.Model):
     
     @password.setter
     def password(self, password):
-        # Use pbkdf2:sha256 method which is widely supported
-        self.password_hash = generate_password_hash(password, method='pbkdf2:sha256')
+        self.password_hash = password_hasher.hash(password)
     
     def verify_password(self, password):
-        return check_password_hash(self.password_hash, password)
+        """Check a password, upgrading the stored hash after a successful match.
+        
+        Legacy werkzeug pbkdf2 hashes and argon2 hashes made with older parameters are
+        replaced by a fresh argon2id hash; the caller commits the session to keep it.
+        """
+        if not self.password_hash.startswith('$argon2'):
+            # Hashes created before the switch to argon2 are still werkzeug pbkdf2
+            valid = check_password_hash(self.password_hash, password)
+            needs_rehash = valid
+        else:
+            try:
+                valid = password_hasher.verify(self.password_hash, password)
+            except (VerificationError, InvalidHash):
+                return False
+            needs_rehash = password_hasher.check_needs_rehash(self.password_hash)
+        if needs_rehash:
+            self.password = password
+        return valid
     
     def get_full_name(self):
         if self.first_name and self.last_name:
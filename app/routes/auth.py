@@ -1,7 +1,6 @@
 from datetime import datetime
 from flask import Blueprint, render_template, redirect, url_for, flash, request
 from flask_login import login_user, logout_user, current_user, login_required
-from werkzeug.security import generate_password_hash, check_password_hash
 from app.models.user import User
 from app.extensions import db
 from app.forms.auth_forms import LoginForm, SignupForm
@@ -60,14 +59,16 @@ def login():
         if user:
             print(f"[SUCCESS] User found in database: {user.email}, Active: {user.is_active}")  # Debug logging
 
-            # Direct password verification using werkzeug
-            from werkzeug.security import check_password_hash
-            password_valid = check_password_hash(user.password_hash, password)
+            # Verify through the model so argon2 and legacy pbkdf2 hashes both work
+            password_valid = user.verify_password(password)
 
             print(f"[AUTH] Database password verification: {password_valid}")  # Debug logging
 
             if password_valid and user.is_active:
                 print(f"[SUCCESS] Database login successful for {user.email}")  # Debug logging
+                if db.session.is_modified(user):
+                    # verify_password upgraded a legacy or outdated hash; persist it
+                    db.session.commit()
                 login_user(user, remember=form.remember.data)
                 next_page = request.args.get('next')
                 print(f"[REDIRECT] Redirecting to: {next_page or url_for('main.index')}")  # Debug logging
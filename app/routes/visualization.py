@@ -3,10 +3,11 @@ Visualization API Endpoints
 
 This module provides API endpoints for generating crime data visualizations.
 """
-from flask import Blueprint, jsonify, request, current_app
+from flask import Blueprint, Response, jsonify, request, current_app
 from flask_login import login_required, current_user
 import json
 import plotly
+import plotly.io as pio
 from datetime import datetime, timedelta
 from typing import Optional, Dict, Any
 
@@ -15,6 +16,27 @@ from app.models.crime_data import CrimeType
 
 bp = Blueprint('visualization', __name__)
 
+def _parse_trend_args():
+    """
+    Parse the query parameters shared by the trend endpoints.
+    
+    Returns:
+        Tuple of (CrimeTrendAnalyzer for the requested date range, time_unit, crime_type_id)
+    """
+    time_unit = request.args.get('time_unit', 'W').upper()
+    crime_type_id = request.args.get('crime_type_id', type=int)
+    
+    # Parse dates
+    start_date = request.args.get('start_date')
+    end_date = request.args.get('end_date')
+    
+    start_date = datetime.strptime(start_date, '%Y-%m-%d') if start_date else None
+    end_date = datetime.strptime(end_date, '%Y-%m-%d') if end_date else None
+    
+    # Initialize analyzer with date range
+    analyzer = CrimeTrendAnalyzer(start_date=start_date, end_date=end_date)
+    return analyzer, time_unit, crime_type_id
+
 @bp.route('/api/visualization/trend', methods=['GET'])
 @login_required
 def get_crime_trend():
@@ -28,28 +50,40 @@ def get_crime_trend():
         end_date: End date (YYYY-MM-DD)
     """
     try:
-        # Parse query parameters
-        time_unit = request.args.get('time_unit', 'W').upper()
-        crime_type_id = request.args.get('crime_type_id', type=int)
+        analyzer, time_unit, crime_type_id = _parse_trend_args()
         
-        # Parse dates
-        start_date = request.args.get('start_date')
-        end_date = request.args.get('end_date')
+        # Generate the plot as JSON (cached) and embed it without re-parsing
+        plot_json = analyzer.plot_trend_json(time_unit=time_unit, crime_type_id=crime_type_id)
         
-        start_date = datetime.strptime(start_date, '%Y-%m-%d') if start_date else None
-        end_date = datetime.strptime(end_date, '%Y-%m-%d') if end_date else None
+        return Response(f'{{"success": true, "plot": {plot_json}}}', mimetype='application/json')
         
-        # Initialize analyzer with date range
-        analyzer = CrimeTrendAnalyzer(start_date=start_date, end_date=end_date)
+    except Exception as e:
+        current_app.logger.error(f"Error generating trend visualization: {str(e)}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@bp.route('/api/visualization/trend/html', methods=['GET'])
+@login_required
+def get_crime_trend_html():
+    """
+    Get the crime trend plot as an embeddable HTML fragment.
+    
+    Query Parameters:
+        time_unit: Time unit for aggregation (D=day, W=week, M=month, Q=quarter, Y=year)
+        crime_type_id: Optional filter for specific crime type
+        start_date: Start date (YYYY-MM-DD)
+        end_date: End date (YYYY-MM-DD)
+    """
+    try:
+        analyzer, time_unit, crime_type_id = _parse_trend_args()
         
-        # Generate the plot
+        # Render straight to an HTML partial; validate=False skips the schema walk
         fig = analyzer.plot_trend(time_unit=time_unit, crime_type_id=crime_type_id)
+        html = pio.to_html(fig, include_plotlyjs='cdn', full_html=False, validate=False, div_id='trend')
         
-        # Convert to JSON for frontend
-        return jsonify({
-            'success': True,
-            'plot': json.loads(fig.to_json())
-        })
+        return Response(html, mimetype='text/html')
         
     except Exception as e:
         current_app.logger.error(f"Error generating trend visualization: {str(e)}")
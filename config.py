@@ -32,6 +32,11 @@ class Config:
     # Pagination
     ITEMS_PER_PAGE = 20
 
+    # Caching (set CACHE_TYPE=RedisCache and CACHE_REDIS_URL to share across workers)
+    CACHE_TYPE = os.environ.get('CACHE_TYPE', 'SimpleCache')
+    CACHE_REDIS_URL = os.environ.get('CACHE_REDIS_URL')
+    CACHE_DEFAULT_TIMEOUT = 3600
+
     # Server configuration for URL building
     SERVER_NAME = os.environ.get('SERVER_NAME') or None
     APPLICATION_ROOT = '/'
@@ -45,6 +50,7 @@ class TestingConfig(Config):
     TESTING = True
     SQLALCHEMY_DATABASE_URI = 'sqlite:///:memory:'
     WTF_CSRF_ENABLED = False
+    CACHE_TYPE = 'NullCache'
 
 # Configuration dictionary
 config = {
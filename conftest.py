@@ -0,0 +1,33 @@
+"""
+Fixtures shared by the root-level test scripts
+"""
+
+import os
+import sys
+
+import pytest
+
+# Add the current directory to Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from shared_app import get_app, log_in, seed_demo_user
+
+@pytest.fixture(scope="session")
+def app():
+    """Flask app shared by every test in the session"""
+    return get_app()
+
+@pytest.fixture(scope="session", autouse=True)
+def demo_user(app):
+    """Seed the demo admin once per session (per xdist worker); yields its user id"""
+    return seed_demo_user(app)
+
+@pytest.fixture
+def client(app):
+    """Fresh, anonymous test client"""
+    return app.test_client()
+
+@pytest.fixture(scope="session")
+def authed_client(app, demo_user):
+    """Test client logged in once as the demo admin, without a login request"""
+    return log_in(app.test_client(), demo_user)
@@ -12,7 +12,10 @@ from flask_sqlalchemy import SQLAlchemy
 from config import Config
 from datetime import datetime
 from flask_login import UserMixin
-from werkzeug.security import generate_password_hash, check_password_hash
+from sqlalchemy import insert, select
+from sqlalchemy.orm import load_only
+from argon2.exceptions import InvalidHash, VerificationError
+from app.models.user import password_hasher
 
 def fix_users():
     """Fix users in database with correct password hashing"""
@@ -42,10 +45,13 @@ def fix_users():
         last_login = db.Column(db.DateTime)
         
         def set_password(self, password):
-            self.password_hash = generate_password_hash(password, method='pbkdf2:sha256')
+            self.password_hash = password_hasher.hash(password)
         
         def verify_password(self, password):
-            return check_password_hash(self.password_hash, password)
+            try:
+                return password_hasher.verify(self.password_hash, password)
+            except (VerificationError, InvalidHash):
+                return False
     
     with app.app_context():
         # Clear all existing users
@@ -56,54 +62,34 @@ def fix_users():
         # Create demo users with correct password hashing
         print("👥 Creating demo users...")
         
-        # Admin user
-        admin_user = User(
-            email='admin@crimesense.com',
-            username='admin',
-            first_name='Admin',
-            last_name='User',
-            is_active=True,
-            is_admin=True,
-            email_confirmed=True
-        )
-        admin_user.set_password('admin123')
-        
-        # Regular user
-        demo_user = User(
-            email='user@crimesense.com',
-            username='user',
-            first_name='Demo',
-            last_name='User',
-            is_active=True,
-            is_admin=False,
-            email_confirmed=True
-        )
-        demo_user.set_password('user123')
-        
-        # Test user
-        test_user = User(
-            email='demo@crimesense.com',
-            username='demo',
-            first_name='Test',
-            last_name='User',
-            is_active=True,
-            is_admin=False,
-            email_confirmed=True
-        )
-        test_user.set_password('demo123')
-        
-        # Add users to database
-        db.session.add(admin_user)
-        db.session.add(demo_user)
-        db.session.add(test_user)
+        demo_users = [
+            # Admin user
+            dict(email='admin@crimesense.com', username='admin', first_name='Admin',
+                 last_name='User', is_admin=True, password='admin123'),
+            # Regular user
+            dict(email='user@crimesense.com', username='user', first_name='Demo',
+                 last_name='User', is_admin=False, password='user123'),
+            # Test user
+            dict(email='demo@crimesense.com', username='demo', first_name='Test',
+                 last_name='User', is_admin=False, password='demo123'),
+        ]
+        rows = []
+        for demo in demo_users:
+            row = dict(demo, is_active=True, email_confirmed=True)
+            row['password_hash'] = password_hasher.hash(row.pop('password'))
+            rows.append(row)
         
         try:
+            # Add users with one executemany INSERT instead of a flush per ORM object
+            db.session.execute(insert(User), rows)
             db.session.commit()
             print("✅ Demo users created successfully!")
             
             # Verify users
             print("\n🔍 Verifying users...")
-            users = User.query.all()
+            users = db.session.scalars(
+                select(User).options(load_only(User.email, User.password_hash))
+            ).all()
             for user in users:
                 print(f"📧 {user.email} - Testing password...")
                 test_passwords = {
@@ -0,0 +1,33 @@
+"""Add generated date_day column to crime reports
+
+Revision ID: b7c41e2d9a10
+Revises: update_password_hashes
+Create Date: 2025-08-26 10:15:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b7c41e2d9a10'
+down_revision = 'update_password_hashes'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('crime_reports', schema=None) as batch_op:
+        batch_op.add_column(sa.Column(
+            'date_day',
+            sa.Date(),
+            sa.Computed('date(date_occurred)', persisted=True),
+            nullable=True
+        ))
+        batch_op.create_index('idx_crime_date_day_type', ['date_day', 'crime_type_id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('crime_reports', schema=None) as batch_op:
+        batch_op.drop_index('idx_crime_date_day_type')
+        batch_op.drop_column('date_day')
@@ -0,0 +1,30 @@
+"""Add covering (crime_type_id, date_day) index to crime reports
+
+Revision ID: c3e8f05a71b2
+Revises: b7c41e2d9a10
+Create Date: 2025-08-26 11:40:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'c3e8f05a71b2'
+down_revision = 'b7c41e2d9a10'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('crime_reports', schema=None) as batch_op:
+        batch_op.create_index(
+            'idx_crime_type_date_day',
+            ['crime_type_id', 'date_day'],
+            unique=False,
+            postgresql_include=['id']
+        )
+
+
+def downgrade():
+    with op.batch_alter_table('crime_reports', schema=None) as batch_op:
+        batch_op.drop_index('idx_crime_type_date_day')
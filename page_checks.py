@@ -0,0 +1,70 @@
+"""
+Multi-token content matching shared by the page test scripts
+"""
+
+import re
+
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+def build_matcher(tokens):
+    """Build a function that returns which of `tokens` occur in a page.
+    
+    The page is scanned once for all tokens: with a pyahocorasick automaton
+    when it is installed, otherwise with one compiled alternation regex.
+    
+    Args:
+        tokens: Iterable of substrings to look for, all str or all bytes
+            (bytes tokens let callers search a raw response body without decoding it)
+        
+    Returns:
+        Callable ``match(content, wanted=None)`` returning the set of tokens found
+        in the page; with ``wanted`` given, only those tokens are reported and the
+        scan stops as soon as all of them have been seen
+    """
+    tokens = set(tokens)
+    is_bytes = any(isinstance(token, bytes) for token in tokens)
+    # pyahocorasick is built for either str or bytes keys, not both
+    if ahocorasick is not None and getattr(ahocorasick, 'unicode', True) != is_bytes:
+        automaton = ahocorasick.Automaton()
+        for token in tokens:
+            automaton.add_word(token, token)
+        automaton.make_automaton()
+        
+        def match(content, wanted=None):
+            remaining = set(tokens if wanted is None else wanted)
+            found = set()
+            for _, token in automaton.iter(content):
+                if token in remaining:
+                    remaining.discard(token)
+                    found.add(token)
+                    if not remaining:
+                        break
+            return found
+        
+        return match
+    
+    # Lookahead so overlapping tokens are all reported; at each position only the
+    # longest token matches, so tokens nested inside it are added afterwards
+    escaped = [re.escape(token) for token in sorted(tokens, key=len, reverse=True)]
+    if is_bytes:
+        pattern = re.compile(b'(?=(' + b'|'.join(escaped) + b'))')
+    else:
+        pattern = re.compile('(?=(' + '|'.join(escaped) + '))')
+    nested = {token: {other for other in tokens if other in token} for token in tokens}
+    
+    def match(content, wanted=None):
+        remaining = set(tokens if wanted is None else wanted)
+        found = set()
+        for hit in pattern.finditer(content):
+            new = nested[hit.group(1)] & remaining
+            if new:
+                remaining -= new
+                found |= new
+                if not remaining:
+                    break
+        return found
+    
+    return match
@@ -0,0 +1,89 @@
+"""
+Flask app shared by the test scripts
+"""
+
+DEMO_EMAIL = 'admin@crimesense.com'
+DEMO_PASSWORD = 'admin123'
+
+# Built on first use and reused by every test in the process
+_APP = None
+
+def get_app():
+    """Return the shared Flask app, creating it on first use.
+    
+    Blueprints, extensions, Jinja and the database engine are set up once per
+    process instead of once per test. The app uses TestingConfig, so its
+    database is in-memory SQLite and create_app() builds the schema in it.
+    
+    Compiled templates go to Jinja's on-disk bytecode cache, so every xdist
+    worker and every later run loads them instead of parsing them again.
+    
+    Returns:
+        The Flask application, with testing mode enabled
+    """
+    global _APP
+    if _APP is None:
+        from jinja2 import FileSystemBytecodeCache
+        from app import create_app
+        from config import TestingConfig
+        _APP = create_app(TestingConfig)
+        # Templates do not change during a run, so skip the per-render mtime checks
+        _APP.config['TEMPLATES_AUTO_RELOAD'] = False
+        _APP.jinja_env.auto_reload = False
+        _APP.jinja_env.bytecode_cache = FileSystemBytecodeCache()
+    return _APP
+
+def seed_demo_user(app):
+    """Make sure the demo admin exists; checks each app's database only once
+    
+    Only runs against a testing app (TestingConfig: in-memory SQLite, CSRF off).
+    The id is remembered in app.extensions, so another app (and its database)
+    is seeded on its own.
+    
+    Returns:
+        The demo admin's user id
+    """
+    if 'demo_user_id' in app.extensions:
+        return app.extensions['demo_user_id']
+    
+    # Never write test users into a development or production database
+    if not app.testing:
+        raise RuntimeError("Refusing to seed the demo user: app is not in testing mode")
+    
+    from app.models.user import User
+    from app.extensions import db
+    
+    with app.app_context():
+        demo_user = User.query.filter_by(email=DEMO_EMAIL).first()
+        if not demo_user:
+            demo_user = User(
+                email=DEMO_EMAIL,
+                username='admin',
+                first_name='Admin',
+                last_name='User',
+                password=DEMO_PASSWORD,
+                is_active=True,
+                is_admin=True
+            )
+            db.session.add(demo_user)
+            db.session.commit()
+        app.extensions['demo_user_id'] = demo_user.id
+    return app.extensions['demo_user_id']
+
+def log_in(client, user_id):
+    """Log a test client in by writing the Flask-Login session keys directly.
+    
+    Skips the /auth/login round-trip and its password hash check; use it
+    wherever the login itself is not what is being tested.
+    
+    Args:
+        client: Flask test client
+        user_id: Id of the user to log in as
+        
+    Returns:
+        The same client, now carrying an authenticated session cookie
+    """
+    with client.session_transaction() as session:
+        session['_user_id'] = str(user_id)
+        session['_fresh'] = True
+    return client
@@ -0,0 +1,34 @@
+"""
+Script to precompute simplified India state boundaries for the interactive map.
+"""
+from pathlib import Path
+import geopandas as gpd
+
+# Douglas-Peucker tolerance in degrees (~1 km), invisible at state-level zoom
+SIMPLIFY_TOLERANCE = 0.01
+
+def build_simplified_states():
+    """Write a simplified copy of INDIA_STATES.geojson next to the original."""
+    # Define paths
+    project_root = Path(__file__).parent.parent.parent
+    maps_dir = project_root / "data" / "raw" / "geographic" / "maps"
+    source = maps_dir / "INDIA_STATES.geojson"
+    target = maps_dir / "INDIA_STATES_simplified.geojson"
+    
+    if not source.exists():
+        print(f"Error: GeoJSON file not found at {source}")
+        return None
+    
+    print(f"Simplifying {source.name}...")
+    gdf = gpd.read_file(source)
+    if gdf.crs is not None and gdf.crs.to_epsg() != 4326:
+        gdf = gdf.to_crs(epsg=4326)
+    gdf['geometry'] = gdf.geometry.simplify(SIMPLIFY_TOLERANCE, preserve_topology=True)
+    gdf.to_file(target, driver='GeoJSON')
+    
+    before, after = source.stat().st_size, target.stat().st_size
+    print(f"Wrote {target} ({after / 1024:.0f} KB, was {before / 1024:.0f} KB)")
+    return target
+
+if __name__ == "__main__":
+    build_simplified_states()
@@ -63,7 +63,6 @@ import shap
 
 # Time series analysis
 from scipy import stats
-from scipy.signal import find_peaks
 
 # Data processing
 import os
@@ -93,6 +92,7 @@ class CrimePredictionEngine:
         self.feature_importance = {}
         self.prediction_cache = {}
         self.baseline_models = {}
+        self._trend_cache = {}
         
         # Model configuration
         self.cv_folds = 5
@@ -674,7 +674,8 @@ class CrimePredictionEngine:
             (self.processed_data['year'].isin(recent_years))
         ].copy()
         
-        if district_data.empty:
+        district_found = not district_data.empty
+        if not district_found:
             # Use overall average if no data for this district
             district_data = self.processed_data[
                 self.processed_data['year'].isin(recent_years)
@@ -691,8 +692,12 @@ class CrimePredictionEngine:
         
         # 2. Trend component (0-3 points)
         trend_score = 0
+        trend = None
         if len(district_data) > 1:
-            trend = district_data['total_crimes'].pct_change().mean()
+            if district_found:
+                trend = self._district_trends(tuple(recent_years)).get(district, np.nan)
+            else:
+                trend = district_data['total_crimes'].pct_change().mean()
             if trend < -0.1:  # Significant decrease
                 trend_score = 3
             elif trend < 0:    # Slight decrease
@@ -700,14 +705,13 @@ class CrimePredictionEngine:
             elif trend < 0.1:  # Stable
                 trend_score = 1
         
-        # 3. Crime type severity (0-2 points)
-        severity_score = 0
-        for crime_type in ['murder', 'rape', 'robbery', 'arson']:
-            if crime_type in district_data.columns:
-                crime_rate = district_data[crime_type].mean() / (district_data['total_crimes'].mean() + 1e-6)
-                if crime_type in ['murder', 'rape'] and crime_rate > 0.1:  # More severe crimes
-                    severity_score -= 0.5
-        severity_score = max(0, 2 + severity_score)  # Cap at 2
+        # Per-crime means over the window, computed in a single pass
+        crime_types = [ct for ct in ['murder', 'rape', 'robbery', 'arson'] if ct in district_data.columns]
+        crime_means = district_data[crime_types].mean()
+        
+        # 3. Crime type severity (0-2 points): -0.5 for each severe crime above 10% of the total
+        severe_rates = crime_means.reindex(['murder', 'rape']).dropna() / (district_avg + 1e-6)
+        severity_score = max(0, 2 - 0.5 * int((severe_rates > 0.1).sum()))  # Cap at 2
         
         # Calculate final score (0-10 scale)
         safety_score = min(10, crime_rate_score + trend_score + severity_score)
@@ -734,8 +738,7 @@ class CrimePredictionEngine:
         }
         
         # Add trend information
-        if len(district_data) > 1:
-            trend = district_data['total_crimes'].pct_change().mean()
+        if trend is not None:
             result['trend'] = {
                 'direction': 'decreasing' if trend < 0 else 'increasing',
                 'rate': abs(round(trend * 100, 1)),  # as percentage
@@ -752,16 +755,39 @@ class CrimePredictionEngine:
             
             # Add top crime types
             crime_breakdown = {}
-            for crime_type in ['murder', 'rape', 'robbery', 'arson']:
-                if crime_type in district_data.columns:
-                    crime_breakdown[crime_type] = {
-                        'count': round(district_data[crime_type].mean(), 1),
-                        'percentage': round(100 * district_data[crime_type].mean() / (district_avg + 1e-6), 1)
-                    }
+            for crime_type, crime_mean in crime_means.items():
+                crime_breakdown[crime_type] = {
+                    'count': round(crime_mean, 1),
+                    'percentage': round(100 * crime_mean / (district_avg + 1e-6), 1)
+                }
             result['crime_breakdown'] = crime_breakdown
         
         return result
     
+    def _district_trends(self, years: Tuple[int, ...]) -> pd.Series:
+        """Mean year-over-year change in total crimes for every district.
+        
+        Computed for all districts at once from a year x district pivot and
+        cached per year window, so scoring a single district is a lookup.
+        
+        Args:
+            years: Years to include, in ascending order
+            
+        Returns:
+            Series of mean fractional change indexed by district
+        """
+        if years not in self._trend_cache:
+            recent = self.processed_data[self.processed_data['year'].isin(years)]
+            yearly_totals = recent.pivot_table(
+                index='year', columns='district', values='total_crimes', aggfunc='sum'
+            )
+            # Skip each district's missing years so the change bridges the gap, as the
+            # per-district pct_change over that district's own rows did
+            self._trend_cache[years] = yearly_totals.apply(
+                lambda totals: totals.dropna().pct_change().mean()
+            )
+        return self._trend_cache[years]
+    
     def get_high_risk_predictions(self, top_n: int = 10) -> List[Dict]:
         """Get top high-risk areas based on predictions."""
         districts = self.processed_data['district'].unique()
@@ -803,8 +829,11 @@ class CrimePredictionEngine:
         yearly_stats['growth_rate'] = yearly_stats['sum'].pct_change() * 100
         
         # Find peak crime periods
+        # A year is a peak when it is strictly above both neighbours
         crime_values = yearly_stats['sum'].values
-        peaks, _ = find_peaks(crime_values)
+        peaks = np.flatnonzero(
+            (crime_values[1:-1] > crime_values[:-2]) & (crime_values[1:-1] > crime_values[2:])
+        ) + 1
         
         return {
             'yearly_trends': yearly_stats.to_dict('records'),
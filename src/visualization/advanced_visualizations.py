@@ -6,16 +6,39 @@ including temporal patterns, geospatial heatmaps, and statistical relationships.
 """
 
 import os
+import hashlib
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
 from pathlib import Path
 
-# Set style for visualizations
-plt.style.use('ggplot')
-sns.set_theme(style="whitegrid")
-plt.rcParams['figure.facecolor'] = 'white'
+@lru_cache(maxsize=1)
+def _get_plotting():
+    """Import and style matplotlib/seaborn on first use.
+    
+    Deferred so that callers that only need load_data() do not pay for the
+    plotting stack at import time.
+    """
+    import matplotlib
+    matplotlib.use('Agg')  # Headless backend, safe to use from worker processes
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+    
+    # Set style for visualizations
+    plt.style.use('ggplot')
+    sns.set_theme(style="whitegrid")
+    plt.rcParams['figure.facecolor'] = 'white'
+    return plt, sns
+
+# The plotting functions draw on one shared figure instead of allocating a new one
+_FIGURE_NUM = 'advanced_visualizations'
+
+def _reset_figure(plt, figsize):
+    """Return the shared figure, cleared and resized for the next plot."""
+    fig = plt.figure(num=_FIGURE_NUM, clear=True)
+    fig.set_size_inches(figsize)
+    return fig
 
 # Constants
 # Using absolute path to avoid path resolution issues
@@ -23,6 +46,28 @@ PROJECT_ROOT = Path(__file__).parent.parent.parent  # Go up three levels to reac
 DATA_DIR = PROJECT_ROOT / "data" / "raw" / "ncrb" / "district_wise" / "vulnerable_groups"
 OUTPUT_DIR = PROJECT_ROOT / "reports" / "figures"
 os.makedirs(OUTPUT_DIR, exist_ok=True)
+# Preprocessed frames are cached outside the published figures (git-ignored)
+CACHE_DIR = PROJECT_ROOT / "data" / "cache"
+# Part of the cache key; bump whenever load_data()'s preprocessing or dtypes change
+_CACHE_VERSION = 2
+
+# Pillow/libwebp encoder settings for raster figures (faster than libpng)
+WEBP_OPTIONS = {'method': 4, 'quality': 90}
+
+# Label columns in the NCRB district-wise tables; everything else is a count
+TEXT_COLUMNS = ['State/UT', 'District']
+
+def _preproc_cache_path(source):
+    """Parquet cache path for a source file, keyed on its path, mtime and size.
+    
+    Any edit to the source (or pointing at a different file) yields a new name,
+    so a stale cache is never read back. _CACHE_VERSION is part of the key too,
+    so frames written by older preprocessing are not reused.
+    """
+    source = Path(source).resolve()
+    stat = source.stat()
+    key = hashlib.sha1(f"v{_CACHE_VERSION}:{source}:{stat.st_mtime_ns}:{stat.st_size}".encode()).hexdigest()[:12]
+    return CACHE_DIR / f"{source.stem}-{key}.parquet"
 
 def load_data():
     """Load and preprocess the crime data."""
@@ -32,14 +77,35 @@ def load_data():
         print(f"Current working directory: {os.getcwd()}")
         print(f"Full path to file: {os.path.abspath(women_crime_file)}")
         print(f"File exists: {os.path.exists(women_crime_file)}")
+
+        # Reuse the preprocessed frame while the source CSV is unchanged
+        cache_path = _preproc_cache_path(women_crime_file)
+        if cache_path.exists():
+            print(f"Loading cached data from: {cache_path}")
+            return pd.read_parquet(cache_path, engine='pyarrow')
+
         print(f"Loading data from: {women_crime_file}")
-        df = pd.read_csv(women_crime_file, encoding='latin1')
+        # The multithreaded Arrow reader avoids per-row Python decoding
+        df = pd.read_csv(women_crime_file, engine='pyarrow', encoding='latin1')
+        text_cols = [col for col in TEXT_COLUMNS if col in df.columns]
+        df[text_cols] = df[text_cols].astype('string')
         
         # Basic preprocessing
         df = df.dropna()
+        # Crime counts fit in 32 bits; halves the bytes moved by the aggregations
+        int_cols = df.select_dtypes(include=['integer']).columns
+        float_cols = df.select_dtypes(include=['floating']).columns
+        df[int_cols] = df[int_cols].astype('int32')
+        df[float_cols] = df[float_cols].astype('float32')
         # Convert state names to title case for better readability
         if 'State/UT' in df.columns:
             df['State/UT'] = df['State/UT'].str.title()
+
+        try:
+            CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            df.to_parquet(cache_path, engine='pyarrow', compression='zstd')
+        except OSError as e:
+            print(f"Could not write preprocessing cache {cache_path}: {e}")
         return df
     except Exception as e:
         print(f"Error loading data: {e}")
@@ -47,19 +113,36 @@ def load_data():
 
 def plot_temporal_trends(df):
     """Plot temporal trends in crime data."""
+    plt, sns = _get_plotting()
     if 'Year' not in df.columns:
         print("No 'Year' column found for temporal analysis")
         return
     
-    plt.figure(figsize=(14, 7))
-    yearly_data = df.groupby('Year').sum(numeric_only=True).reset_index()
+    crime_cols = [col for col in df.select_dtypes(include=[np.number]).columns
+                  if col not in ['Year', 'Total']]
+    if not crime_cols:
+        print("No crime columns found for temporal analysis")
+        return
+    
+    # Sort rows by year once so each year is a contiguous block
+    order = np.argsort(df['Year'].to_numpy(), kind='stable')
+    years_sorted = df['Year'].to_numpy()[order]
+    values = np.asfortranarray(df[crime_cols].to_numpy()[order])
+    
+    # Select top 5 crime types by total count (partial selection, then order the 5)
+    col_totals = values.sum(axis=0)
+    k = min(5, len(crime_cols))
+    top_idx = np.argpartition(-col_totals, k - 1)[:k]
+    top_idx = top_idx[np.argsort(-col_totals[top_idx], kind='stable')]
     
-    # Select top 5 crime types by total count
-    crime_cols = [col for col in yearly_data.columns if col not in ['Year', 'Total']]
-    top_crimes = yearly_data[crime_cols].sum().sort_values(ascending=False).head(5).index
+    # Per-year sums for the selected columns only
+    years = np.unique(years_sorted)
+    starts = np.searchsorted(years_sorted, years)
+    yearly_values = np.add.reduceat(values[:, top_idx], starts, axis=0)
     
-    for crime in top_crimes:
-        plt.plot(yearly_data['Year'], yearly_data[crime], marker='o', label=crime)
+    fig = _reset_figure(plt, (14, 7))
+    for j, idx in enumerate(top_idx):
+        plt.plot(years, yearly_values[:, j], marker='o', label=crime_cols[idx])
     
     plt.title('Temporal Trends in Crime (Top 5 Categories)', fontsize=16)
     plt.xlabel('Year', fontsize=14)
@@ -69,13 +152,15 @@ def plot_temporal_trends(df):
     plt.tight_layout()
     
     # Save the figure
-    output_path = OUTPUT_DIR / 'temporal_trends.png'
-    plt.savefig(output_path, dpi=300, bbox_inches='tight')
-    plt.close()
+    # Line plot: vector output avoids raster encoding entirely
+    output_path = OUTPUT_DIR / 'temporal_trends.svg'
+    fig.savefig(output_path, bbox_inches='tight')
+    fig.clf()
     print(f"Temporal trends plot saved to: {output_path}")
 
 def plot_geographic_heatmap(df):
     """Create a heatmap of crime distribution by state/UT."""
+    plt, sns = _get_plotting()
     if 'State/UT' not in df.columns:
         print("No 'State/UT' column found for geographic analysis")
         return
@@ -83,18 +168,27 @@ def plot_geographic_heatmap(df):
     # Aggregate data by state
     state_data = df.groupby('State/UT').sum(numeric_only=True).reset_index()
     
-    # Select top 10 states by total crimes
-    state_data = state_data.nlargest(10, 'Total') if 'Total' in state_data.columns else state_data
+    # Select top 10 states by total crimes (partial selection, then order the 10)
+    if 'Total' in state_data.columns:
+        totals = state_data['Total'].to_numpy()
+        if len(totals) > 10:
+            state_data = state_data.iloc[np.argpartition(-totals, 10)[:10]]
+        state_data = state_data.sort_values('Total', ascending=False)
     
     # Prepare data for heatmap (excluding non-numeric columns)
     numeric_cols = state_data.select_dtypes(include=[np.number]).columns
-    heatmap_data = state_data[numeric_cols].transpose()
+    # Build the crime x state array in its display orientation with one contiguous copy
+    values = np.ascontiguousarray(state_data[numeric_cols].to_numpy().T)
+    heatmap_data = pd.DataFrame(values, index=numeric_cols, columns=state_data['State/UT'], copy=False)
     
-    plt.figure(figsize=(14, 10))
+    # Format all cell labels in one vectorized call instead of per-cell in seaborn
+    annot_labels = np.char.mod('%d', np.rint(values).astype(np.int64))
+    
+    fig = _reset_figure(plt, (14, 10))
     sns.heatmap(heatmap_data, 
                 cmap='YlOrRd',
-                annot=True, 
-                fmt='.0f',
+                annot=annot_labels, 
+                fmt='',
                 linewidths=0.5,
                 cbar_kws={'label': 'Number of Cases'})
     
@@ -105,28 +199,34 @@ def plot_geographic_heatmap(df):
     plt.tight_layout()
     
     # Save the figure
-    output_path = OUTPUT_DIR / 'geographic_heatmap.png'
-    plt.savefig(output_path, dpi=300, bbox_inches='tight')
-    plt.close()
+    output_path = OUTPUT_DIR / 'geographic_heatmap.webp'
+    fig.savefig(output_path, dpi=300, bbox_inches='tight', pil_kwargs=WEBP_OPTIONS)
+    fig.clf()
     print(f"Geographic heatmap saved to: {output_path}")
 
 def plot_crime_correlations(df):
     """
     Plot correlation matrix of different crime types.
     """
+    plt, sns = _get_plotting()
     # Select only numeric columns for correlation
     numeric_cols = df.select_dtypes(include=[np.number]).columns
     if len(numeric_cols) < 2:
         print("Not enough numeric columns for correlation analysis")
         return
     
-    # Calculate correlation matrix
-    corr = df[numeric_cols].corr()
-    
+    # Calculate correlation matrix; load_data() already dropped NaNs, so skip
+    # pandas' pairwise NaN handling and use BLAS-backed np.corrcoef on float32
+    X = np.ascontiguousarray(df[numeric_cols].to_numpy(dtype=np.float32))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        corr_values = np.corrcoef(X, rowvar=False, dtype=np.float32)
+    k = len(numeric_cols)
+    corr = pd.DataFrame(corr_values, index=numeric_cols, columns=numeric_cols)
+
     # Create a mask for the upper triangle
-    mask = np.triu(np.ones_like(corr, dtype=bool))
+    mask = np.triu(np.ones((k, k), dtype=bool))
     
-    plt.figure(figsize=(14, 12))
+    fig = _reset_figure(plt, (14, 12))
     sns.heatmap(corr, 
                 mask=mask,
                 cmap='coolwarm',
@@ -139,11 +239,22 @@ def plot_crime_correlations(df):
     plt.tight_layout()
     
     # Save the figure
-    output_path = OUTPUT_DIR / 'crime_correlations.png'
-    plt.savefig(output_path, dpi=300, bbox_inches='tight')
-    plt.close()
+    output_path = OUTPUT_DIR / 'crime_correlations.webp'
+    fig.savefig(output_path, dpi=300, bbox_inches='tight', pil_kwargs=WEBP_OPTIONS)
+    fig.clf()
     print(f"Correlation matrix saved to: {output_path}")
 
+def _render(job):
+    """Run one named plot; top-level so worker processes can unpickle it."""
+    name, df = job
+    PLOTTERS[name](df)
+
+PLOTTERS = {
+    'temporal': plot_temporal_trends,
+    'geo': plot_geographic_heatmap,
+    'corr': plot_crime_correlations,
+}
+
 def main():
     print("Starting advanced visualizations...")
     
@@ -155,10 +266,9 @@ def main():
     
     print(f"Loaded data with {len(df)} rows and {len(df.columns)} columns")
     
-    # Generate visualizations
-    plot_temporal_trends(df)
-    plot_geographic_heatmap(df)
-    plot_crime_correlations(df)
+    # Generate visualizations; each plot renders and encodes in its own process
+    with ProcessPoolExecutor(max_workers=len(PLOTTERS)) as executor:
+        list(executor.map(_render, [(name, df) for name in PLOTTERS]))
     
     print("\nAdvanced visualizations completed!")
 
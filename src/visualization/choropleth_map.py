@@ -13,83 +13,246 @@ This script creates an interactive choropleth map of India with the following fe
 """
 import os
 import json
+import hashlib
+import logging
+import shutil
+import subprocess
 import pandas as pd
-import geopandas as gpd
-import folium
-import branca.colormap as cm
 from pathlib import Path
-from folium.plugins import Search, MiniMap, Fullscreen, MeasureControl
-from folium.features import GeoJsonTooltip
+from functools import lru_cache
 import numpy as np
 
+# geopandas, folium and branca are imported inside the functions that use them
+# so that importing this module (e.g. for map_state_names) stays cheap
+
+logger = logging.getLogger(__name__)
+
 # Custom color scale for the choropleth
 COLOR_SCALE = [
     '#ffffcc', '#ffeda0', '#fed976', '#feb24c',
     '#fd8d3c', '#fc4e2a', '#e31a1c', '#bd0026', '#800026'
 ]
 
+# NCRB crimes-against-women columns used for the state totals
+CRIME_COLUMNS = [
+    'Rape',
+    'Kidnapping & Abduction_Total',
+    'Assault on Women with intent to outrage her Modesty_Total',
+    'Insult to the Modesty of Women_Total',
+    'Cruelty by Husband or his Relatives',
+    'Dowry Deaths'
+]
+
+# Polygon simplification tolerance in degrees (~1 km) for the embedded GeoJSON
+SIMPLIFY_TOLERANCE = 0.01
+
+# Feature properties kept on the enhanced map layer
+MAP_LAYER_COLUMNS = ['STNAME', 'Total_Crimes_Against_Women', 'Crime_Rate', 'Population', '_fill', '_tooltip']
+
+# Crime columns shown as distribution bars in the enhanced tooltip
+TOOLTIP_CRIME_COLUMNS = {
+    'Rape': 'Rape',
+    'Kidnapping': 'Kidnapping & Abduction_Total',
+    'Assault': 'Assault on Women with intent to outrage her Modesty_Total',
+    'Insult to Modesty': 'Insult to the Modesty of Women_Total'
+}
+
+# State/UT populations (example data - replace with actual population data)
+_POPULATION_DATA = {
+    'Andhra Pradesh': 49577103,
+    'Arunachal Pradesh': 1383727,
+    'Assam': 31205576,
+    'Bihar': 104099452,
+    'Chhattisgarh': 25545198,
+    'Goa': 1458545,
+    'Gujarat': 60439692,
+    'Haryana': 25351462,
+    'Himachal Pradesh': 6864602,
+    'Jharkhand': 32988134,
+    'Karnataka': 61095297,
+    'Kerala': 33406061,
+    'Madhya Pradesh': 72626809,
+    'Maharashtra': 112374333,
+    'Manipur': 2570390,
+    'Meghalaya': 2966889,
+    'Mizoram': 1097206,
+    'Nagaland': 1978502,
+    'Odisha': 41974218,
+    'Punjab': 27743338,
+    'Rajasthan': 68548437,
+    'Sikkim': 610577,
+    'Tamil Nadu': 72147030,
+    'Telangana': 35003674,
+    'Tripura': 3673917,
+    'Uttar Pradesh': 199812341,
+    'Uttarakhand': 10086292,
+    'West Bengal': 91276115,
+    'Andaman and Nicobar Islands': 380581,
+    'Chandigarh': 1055450,
+    'Dadra and Nagar Haveli and Daman and Diu': 585764,
+    'Delhi': 16787941,
+    'Jammu and Kashmir': 12267013,
+    'Ladakh': 274289,
+    'Lakshadweep': 64473,
+    'Puducherry': 1247953
+}
+
+# Crime data / GeoJSON state name variants mapped to the GeoJSON spelling.
+# Keys are the normalized (stripped, uppercase) names and must stay unique.
+_STATE_MAPPING = {
+    # Standardize variations for states with multiple names
+    'ANDAMAN & NICOBAR': 'A&N Islands',
+    'ANDAMAN AND NICOBAR': 'A&N Islands',
+    'ANDAMAN & NICOBAR ISLANDS': 'A&N Islands',
+    'A & N ISLANDS': 'A&N Islands',
+    
+    # Union Territories
+    'DADRA & NAGAR HAVELI': 'D&N Haveli',
+    'DADRA AND NAGAR HAVELI': 'D&N Haveli',
+    'DAMAN & DIU': 'Daman & Diu',
+    'DAMAN AND DIU': 'Daman & Diu',
+    'DELHI': 'Delhi UT',
+    'NCT OF DELHI': 'Delhi UT',
+    'NEW DELHI': 'Delhi UT',
+    'PUDUCHERRY': 'Puducherry',
+    'PONDICHERRY': 'Puducherry',
+    'JAMMU & KASHMIR': 'Jammu & Kashmir',
+    'JAMMU AND KASHMIR': 'Jammu & Kashmir',
+    'LADAKH': 'Jammu & Kashmir',  # Temporary until we get Ladakh-specific data
+    'LAKSHADWEEP': 'Lakshadweep',
+    
+    # States with name changes
+    'ORISSA': 'Odisha',
+    'UTTARANCHAL': 'Uttarakhand',
+    
+    # Common misspellings and variations
+    'CHATTISGARH': 'Chhattisgarh',
+    'TAMILNADU': 'Tamil Nadu',
+    'ARUNANCHAL PRADESH': 'Arunachal Pradesh',
+    'MEGHALAY': 'Meghalaya',
+    'MIZORUM': 'Mizoram',
+    
+    # States
+    'GOA': 'Goa',
+    'GUJARAT': 'Gujarat',
+    'HARYANA': 'Haryana',
+    'HIMACHAL PRADESH': 'Himachal Pradesh',
+    'JHARKHAND': 'Jharkhand',
+    'KARNATAKA': 'Karnataka',
+    'KERALA': 'Kerala',
+    'MADHYA PRADESH': 'Madhya Pradesh',
+    'MAHARASHTRA': 'Maharashtra',
+    'MANIPUR': 'Manipur',
+    'MEGHALAYA': 'Meghalaya',
+    'MIZORAM': 'Mizoram',
+    'NAGALAND': 'Nagaland',
+    'ODISHA': 'Odisha',
+    'PUNJAB': 'Punjab',
+    'RAJASTHAN': 'Rajasthan',
+    'SIKKIM': 'Sikkim',
+    'TAMIL NADU': 'Tamil Nadu',
+    'TELANGANA': 'Telangana',
+    'TRIPURA': 'Tripura',
+    'UTTAR PRADESH': 'Uttar Pradesh',
+    'UTTARAKHAND': 'Uttarakhand',
+    'WEST BENGAL': 'West Bengal'
+}
+
 # Set up paths
 project_root = Path(__file__).parent.parent.parent
 data_dir = project_root / 'data'
 geo_data_dir = data_dir / 'raw' / 'geographic'
 output_dir = project_root / 'reports' / 'maps'
 output_dir.mkdir(parents=True, exist_ok=True)
+# Derived files that can be rebuilt from data/raw (git-ignored)
+cache_dir = data_dir / 'cache'
+
+@lru_cache(maxsize=4)
+def _read_geojson(file_path):
+    """Parse a GeoJSON file, going through an on-disk Feather cache.
+    
+    The Feather copy lives in data/cache (never next to the raw source) and is
+    rebuilt whenever the GeoJSON is newer than it. If the cache cannot be
+    written, the parsed frame is still returned.
+    """
+    import geopandas as gpd
+    
+    source = Path(file_path).resolve()
+    path_key = hashlib.sha1(str(source).encode()).hexdigest()[:12]
+    cache_path = cache_dir / f"{source.stem}-{path_key}.feather"
+    if cache_path.exists() and os.path.getmtime(cache_path) >= os.path.getmtime(source):
+        return gpd.read_feather(cache_path)
+    
+    gdf = gpd.read_file(source)
+    try:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        gdf.to_feather(cache_path)
+    except OSError as e:
+        logger.warning("Could not write GeoJSON cache %s: %s", cache_path, e)
+    return gdf
 
 def load_geojson(file_path):
     """Load and return GeoJSON data."""
     try:
-        return gpd.read_file(file_path)
+        # Callers add columns, so hand out a copy of the cached frame
+        return _read_geojson(str(file_path)).copy()
     except Exception as e:
         print(f"Error loading GeoJSON file {file_path}: {e}")
         return None
 
-def create_enhanced_tooltip(row):
-    """Create HTML content for tooltip with crime statistics."""
-    total_crimes = row.get('Total Crimes Against Women', 0)
-    crime_rate = row.get('Crime Rate', 'N/A')
-    
-    # Create crime distribution bars (example with some common crime types)
-    crime_types = {
-        'Rape': row.get('Rape', 0),
-        'Kidnapping': row.get('Kidnapping and Abduction', 0),
-        'Assault': row.get('Assault on Women', 0),
-        'Insult to Modesty': row.get('Insult to Modesty', 0)
-    }
-    
-    # Sort crimes by count (descending)
-    sorted_crimes = sorted(crime_types.items(), key=lambda x: x[1], reverse=True)
-    
-    # Create HTML for crime distribution
-    crime_bars = ''
-    for crime, count in sorted_crimes:
-        if count > 0:
-            width = min(100, (count / max(1, total_crimes)) * 100) if isinstance(total_crimes, (int, float)) else 0
-            crime_bars += f"""
+def create_enhanced_tooltips(df):
+    """Create HTML tooltip content with crime statistics for every state.
+    
+    Percentages and bar ordering are computed for all rows at once with numpy;
+    only the final string assembly happens per row.
+    
+    Args:
+        df (pd.DataFrame): Merged state frame with STNAME, the crime columns,
+            Total_Crimes_Against_Women and optionally Crime_Rate
+            
+    Returns:
+        pd.Series: Tooltip HTML aligned with df.index
+    """
+    labels = list(TOOLTIP_CRIME_COLUMNS)
+    counts = df[list(TOOLTIP_CRIME_COLUMNS.values())].fillna(0).to_numpy()
+    totals = df['Total_Crimes_Against_Women'].fillna(0).to_numpy()
+    widths = np.clip(counts / np.maximum(totals, 1)[:, None] * 100, 0, 100)
+    # Bars are listed by count (descending)
+    order = np.argsort(-counts, axis=1, kind='stable')
+    states = df['STNAME'].fillna('N/A').to_numpy()
+    rates = df['Crime_Rate'].to_numpy() if 'Crime_Rate' in df.columns else np.full(len(df), 'N/A')
+    
+    bar_html = """
             <div style="margin: 3px 0;">
                 <div style="display: flex; justify-content: space-between; font-size: 0.9em;">
                     <span>{crime}</span>
-                    <span>{count:,}</span>
+                    <span>{count:,.0f}</span>
                 </div>
                 <div style="height: 6px; background: #f0f0f0; border-radius: 3px; overflow: hidden;">
-                    <div style="height: 100%; width: {width}%; background: #e34a33;"></div>
+                    <div style="height: 100%; width: {width:.1f}%; background: #e34a33;"></div>
                 </div>
             </div>
             """
     
-    # Create the tooltip HTML
-    html = f"""
+    tooltips = []
+    for i in range(len(df)):
+        crime_bars = ''.join(
+            bar_html.format(crime=labels[j], count=counts[i, j], width=widths[i, j])
+            for j in order[i] if counts[i, j] > 0
+        )
+        tooltips.append(f"""
     <div style="width: 250px;">
         <h4 style="margin: 0 0 8px 0; color: #1a237e; border-bottom: 1px solid #eee; padding-bottom: 4px;">
-            {state_name}
+            {states[i]}
         </h4>
         <div style="margin-bottom: 8px;">
             <div style="display: flex; justify-content: space-between;">
                 <span style="font-weight: 500;">Total Crimes:</span>
-                <span style="font-weight: 600;">{total_crimes:,}</span>
+                <span style="font-weight: 600;">{totals[i]:,.0f}</span>
             </div>
             <div style="display: flex; justify-content: space-between;">
                 <span style="font-weight: 500;">Crime Rate:</span>
-                <span style="font-weight: 600;">{crime_rate} per 100k</span>
+                <span style="font-weight: 600;">{rates[i]} per 100k</span>
             </div>
         </div>
         <div>
@@ -100,97 +263,87 @@ def create_enhanced_tooltip(row):
             Click for detailed analysis
         </div>
     </div>
-    """.format(
-        state_name=row.get('ST_NM', 'N/A'),
-        total_crimes=total_crimes if isinstance(total_crimes, (int, float)) else 'N/A',
-        crime_rate=crime_rate,
-        crime_bars=crime_bars
-    )
+    """)
     
-    return html
+    return pd.Series(tooltips, index=df.index)
 
+@lru_cache(maxsize=1)
 def load_population_data():
-    """Load and return population data for Indian states."""
-    # This is example data - replace with actual population data
-    population_data = {
-        'Andhra Pradesh': 49577103,
-        'Arunachal Pradesh': 1383727,
-        'Assam': 31205576,
-        'Bihar': 104099452,
-        'Chhattisgarh': 25545198,
-        'Goa': 1458545,
-        'Gujarat': 60439692,
-        'Haryana': 25351462,
-        'Himachal Pradesh': 6864602,
-        'Jharkhand': 32988134,
-        'Karnataka': 61095297,
-        'Kerala': 33406061,
-        'Madhya Pradesh': 72626809,
-        'Maharashtra': 112374333,
-        'Manipur': 2570390,
-        'Meghalaya': 2966889,
-        'Mizoram': 1097206,
-        'Nagaland': 1978502,
-        'Odisha': 41974218,
-        'Punjab': 27743338,
-        'Rajasthan': 68548437,
-        'Sikkim': 610577,
-        'Tamil Nadu': 72147030,
-        'Telangana': 35003674,
-        'Tripura': 3673917,
-        'Uttar Pradesh': 199812341,
-        'Uttarakhand': 10086292,
-        'West Bengal': 91276115,
-        'Andaman and Nicobar Islands': 380581,
-        'Chandigarh': 1055450,
-        'Dadra and Nagar Haveli and Daman and Diu': 585764,
-        'Delhi': 16787941,
-        'Jammu and Kashmir': 12267013,
-        'Ladakh': 274289,
-        'Lakshadweep': 64473,
-        'Puducherry': 1247953
-    }
+    """Load and return population data for Indian states.
     
+    The frame is built once and cached; callers must not modify it in place.
+    """
     return pd.DataFrame({
-        'States/UTs': population_data.keys(),
-        'Population': population_data.values()
+        'States/UTs': list(_POPULATION_DATA),
+        'Population': list(_POPULATION_DATA.values())
     })
 
+def export_state_tiles(gdf, name='india_states'):
+    """Build a PMTiles vector-tile archive of the state layer with tippecanoe.
+    
+    Writes ``<name>.geojson`` and ``<name>.pmtiles`` to the maps output
+    directory so the layer can be served as on-demand tiles instead of being
+    inlined into each HTML page.
+    
+    Args:
+        gdf (gpd.GeoDataFrame): State polygons with the properties to keep
+        name (str): Base file name for the outputs
+        
+    Returns:
+        Path: The PMTiles archive, or None if tippecanoe is unavailable or fails
+    """
+    tippecanoe = shutil.which('tippecanoe')
+    if tippecanoe is None:
+        print("tippecanoe not found; skipping PMTiles export")
+        return None
+    
+    geojson_path = output_dir / f'{name}.geojson'
+    pmtiles_path = output_dir / f'{name}.pmtiles'
+    gdf.to_file(geojson_path, driver='GeoJSON')
+    
+    try:
+        subprocess.run(
+            [tippecanoe, '-o', str(pmtiles_path), '--force', '-zg',
+             '--coalesce-densest-as-needed', '-l', name, str(geojson_path)],
+            check=True,
+            capture_output=True
+        )
+    except subprocess.CalledProcessError as e:
+        print(f"Error building PMTiles archive: {e.stderr.decode(errors='replace')}")
+        return None
+    
+    return pmtiles_path
+
 def load_crime_data():
     """Load and preprocess crime data."""
     crime_data_path = data_dir / 'raw' / 'ncrb' / 'district_wise' / 'vulnerable_groups' / '42_District_wise_crimes_committed_against_women_2014.csv'
     
     try:
-        df = pd.read_csv(crime_data_path, encoding='latin1')
-        print(f"Loaded crime data with {len(df)} records")
+        # Only parse the state key and the crime columns used downstream
+        df = pd.read_csv(
+            crime_data_path,
+            encoding='latin1',
+            usecols=['States/UTs'] + CRIME_COLUMNS,
+            dtype={'States/UTs': 'category', **{col: 'float32' for col in CRIME_COLUMNS}}
+        )
+        # Counts are read as floats so empty cells load as NaN; they count as zero
+        df[CRIME_COLUMNS] = df[CRIME_COLUMNS].fillna(0).astype('int32')
+        logger.debug("Loaded crime data with %d records", len(df))
         
-        # Basic preprocessing - this will need to be adjusted based on actual data structure
-        # Print column names for debugging
-        print("\nAvailable columns in crime data:")
-        print(df.columns.tolist())
+        # Group by state and sum the crime columns (categorical codes, no string hashing)
+        state_crime = df.groupby('States/UTs', sort=False, observed=True).sum().reset_index()
         
-        # Group by state and sum all crime columns
-        if 'States/UTs' in df.columns:
-            # Sum all numeric columns for each state
-            numeric_cols = df.select_dtypes(include=['int64', 'float64']).columns
-            state_crime = df.groupby('States/UTs')[numeric_cols].sum().reset_index()
-            
-            # Print sample of grouped data
-            print("\nSample of grouped crime data:")
-            print(state_crime.head())
-            
-            # Calculate total crimes per state (excluding year column if it exists)
-            crime_columns = [col for col in numeric_cols if col != 'Year']
-            state_crime['Total_Crimes'] = state_crime[crime_columns].sum(axis=1)
-            
-            # Normalize by population (if population data is available)
-            # This is a placeholder - you'll need to load actual population data
-            state_crime['Crime_Rate'] = state_crime['Total_Crimes']  # Placeholder
-            
-            return state_crime
-        else:
-            print("Warning: 'STATE/UT' column not found in crime data")
-            return None
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Sample of grouped crime data:\n%s", state_crime.head().to_string())
+        
+        # Calculate total crimes per state
+        state_crime['Total_Crimes'] = state_crime[CRIME_COLUMNS].sum(axis=1)
+        
+        # Normalize by population (if population data is available)
+        # This is a placeholder - you'll need to load actual population data
+        state_crime['Crime_Rate'] = state_crime['Total_Crimes']  # Placeholder
+        
+        return state_crime
             
     except Exception as e:
         print(f"Error loading crime data: {e}")
@@ -211,93 +364,73 @@ def map_state_names(state_name):
     # Convert to uppercase and strip whitespace for consistent comparison
     state_name = state_name.upper().strip()
     
-    mapping = {
-        # Standardize variations for states with multiple names
-        'ANDAMAN & NICOBAR': 'A&N Islands',
-        'ANDAMAN AND NICOBAR': 'A&N Islands',
-        'ANDAMAN & NICOBAR ISLANDS': 'A&N Islands',
-        'A & N ISLANDS': 'A&N Islands',
-        
-        # Union Territories
-        'DADRA & NAGAR HAVELI': 'D&N Haveli',
-        'DADRA AND NAGAR HAVELI': 'D&N Haveli',
-        'DAMAN & DIU': 'Daman & Diu',
-        'DAMAN AND DIU': 'Daman & Diu',
-        'DELHI': 'Delhi UT',
-        'NCT OF DELHI': 'Delhi UT',
-        'NEW DELHI': 'Delhi UT',
-        'PUDUCHERRY': 'Puducherry',
-        'PONDICHERRY': 'Puducherry',
-        'JAMMU & KASHMIR': 'Jammu & Kashmir',
-        'JAMMU AND KASHMIR': 'Jammu & Kashmir',
-        'LADAKH': 'Jammu & Kashmir',  # Temporary until we get Ladakh-specific data
-        
-        # States with name changes
-        'ORISSA': 'Odisha',
-        'UTTARANCHAL': 'Uttarakhand',
-        
-        # Common misspellings and variations
-        'CHATTISGARH': 'Chhattisgarh',
-        'UTTAR PRADESH': 'Uttar Pradesh',
-        'MADHYA PRADESH': 'Madhya Pradesh',
-        'TAMILNADU': 'Tamil Nadu',
-        'TAMIL NADU': 'Tamil Nadu',
-        'WEST BENGAL': 'West Bengal',
-        'ARUNANCHAL PRADESH': 'Arunachal Pradesh',
-        'MEGHALAY': 'Meghalaya',
-        'MIZORUM': 'Mizoram',
-        'NAGALAND': 'Nagaland',
-        'SIKKIM': 'Sikkim',
-        'TRIPURA': 'Tripura',
-        'GOA': 'Goa',
-        'GUJARAT': 'Gujarat',
-        'HARYANA': 'Haryana',
-        'HIMACHAL PRADESH': 'Himachal Pradesh',
-        'JAMMU & KASHMIR': 'Jammu & Kashmir',
-        'JHARKHAND': 'Jharkhand',
-        'KARNATAKA': 'Karnataka',
-        'KERALA': 'Kerala',
-        'LAKSHADWEEP': 'Lakshadweep',
-        'MADHYA PRADESH': 'Madhya Pradesh',
-        'MAHARASHTRA': 'Maharashtra',
-        'MANIPUR': 'Manipur',
-        'MEGHALAYA': 'Meghalaya',
-        'MIZORAM': 'Mizoram',
-        'NAGALAND': 'Nagaland',
-        'ODISHA': 'Odisha',
-        'PUDUCHERRY': 'Puducherry',
-        'PUNJAB': 'Punjab',
-        'RAJASTHAN': 'Rajasthan',
-        'SIKKIM': 'Sikkim',
-        'TAMIL NADU': 'Tamil Nadu',
-        'TELANGANA': 'Telangana',
-        'TRIPURA': 'Tripura',
-        'UTTAR PRADESH': 'Uttar Pradesh',
-        'UTTARAKHAND': 'Uttarakhand',
-        'WEST BENGAL': 'West Bengal'
-    }
-    
-    # Convert input to string, strip whitespace, and convert to uppercase for matching
-    state_name = str(state_name).strip().upper()
-    
     # Special case for Delhi
     if 'DELHI' in state_name:
         return 'Delhi UT'
     
-    # Check if the state name is in our mapping
-    if state_name in state_mapping:
-        return state_mapping[state_name]
+    # Keys are already normalized, so one lookup covers every case-insensitive
+    # match; fall back to the title-cased name
+    return _STATE_MAPPING.get(state_name, state_name.title())
+
+def map_state_names_vec(state_names):
+    """Vectorized map_state_names over a Series of state/UT names.
+    
+    Each distinct name is mapped once; the results are then gathered by the
+    categorical codes, so the cost scales with the number of states rather
+    than the number of rows.
     
-    # Try to find a partial match (case-insensitive)
-    for key, value in state_mapping.items():
-        if key.upper() == state_name.upper():
-            return value
+    Args:
+        state_names (pd.Series): State/UT names to be standardized
+        
+    Returns:
+        pd.Series: Standardized names; missing entries stay missing
+    """
+    categorical = state_names.astype('category')
+    # Trailing NaN is the lookup for code -1 (missing values)
+    lut = np.array(
+        [map_state_names(name) for name in categorical.cat.categories] + [np.nan],
+        dtype=object
+    )
+    return pd.Series(lut[categorical.cat.codes.to_numpy()], index=state_names.index)
+
+def _color_bins(max_crimes):
+    """Equal-width bin edges from 0 to max_crimes, one bin per COLOR_SCALE entry."""
+    return np.linspace(0, max(float(max_crimes), 1.0), len(COLOR_SCALE) + 1)
+
+def _fill_colors(crime_counts):
+    """Look up the COLOR_SCALE fill colour for each crime count.
     
-    # If no match found, return the original name (in title case for consistency)
-    return state_name.title()
+    Args:
+        crime_counts (np.ndarray): NaN-free crime counts
+        
+    Returns:
+        np.ndarray: Hex colour string per count
+    """
+    bins = _color_bins(crime_counts.max() if len(crime_counts) else 0)
+    idx = np.clip(np.digitize(crime_counts, bins) - 1, 0, len(COLOR_SCALE) - 1)
+    return np.asarray(COLOR_SCALE)[idx]
+
+# Merged (gdf, crime_data) from the first successful _prepare_data() call
+_PREPARED = None
+
+def _prepare_data():
+    """Load crime and boundary data and merge them by state, once per process.
+    
+    Both map builders share the result, so they must not modify it in place.
+    Only a successful load is kept; after a failure the next call tries again,
+    so a missing or late input file does not stick for the whole process.
+    
+    Returns:
+        tuple: (gdf, crime_data) with the merged GeoDataFrame and the state-level
+        crime data, or None if either input could not be loaded
+    """
+    global _PREPARED
+    if _PREPARED is None:
+        _PREPARED = _load_and_merge()
+    return _PREPARED
 
-def create_enhanced_choropleth_map():
-    """Create an enhanced interactive choropleth map with additional features."""
+def _load_and_merge():
+    """Build the (gdf, crime_data) pair behind _prepare_data(), or None on failure."""
     # Load GeoJSON data
     states_geojson = geo_data_dir / 'maps' / 'INDIA_STATES.geojson'
     if not states_geojson.exists():
@@ -310,19 +443,22 @@ def create_enhanced_choropleth_map():
         print("Error: Could not load or process crime data")
         return None
     
-    # Calculate total crimes against women by state
-    crime_data = crime_data.groupby('States/UTs').sum(numeric_only=True).reset_index()
-    crime_data['Total_Crimes_Against_Women'] = crime_data[['Rape', 'Kidnapping & Abduction_Total', 'Assault on Women with intent to outrage her Modesty_Total', 'Insult to the Modesty of Women_Total', 'Cruelty by Husband or his Relatives', 'Dowry Deaths']].sum(axis=1)
+    # Total crimes against women by state; load_crime_data() already aggregated
+    # by state and summed CRIME_COLUMNS into Total_Crimes
+    crime_data['Total_Crimes_Against_Women'] = crime_data['Total_Crimes']
+    
+    # Load population data and merge with crime data to calculate crime rates
+    population_data = load_population_data()
+    if population_data is not None and not population_data.empty:
+        crime_data = crime_data.merge(population_data, on='States/UTs', how='left')
     
     # Calculate crime rate per 100,000 population if population data is available
     if 'Population' in crime_data.columns:
         crime_data['Crime_Rate'] = (crime_data['Total_Crimes_Against_Women'] / crime_data['Population']) * 100000
         crime_data['Crime_Rate'] = crime_data['Crime_Rate'].round(2)
     
-    # Load population data and merge with crime data to calculate crime rates
-    population_data = load_population_data()
-    if population_data is not None and not population_data.empty:
-        crime_data = crime_data.merge(population_data, on='States/UTs', how='left')
+    # Map state names to match GeoJSON
+    crime_data['State_Geo'] = map_state_names_vec(crime_data['States/UTs'])
     
     # Load GeoJSON
     gdf = load_geojson(states_geojson)
@@ -330,39 +466,78 @@ def create_enhanced_choropleth_map():
         return None
     
     # Map state names and merge with crime data
-    print("\nAvailable columns in GeoDataFrame:", gdf.columns.tolist())
-    print("\nSample state names in GeoJSON:", gdf['STNAME'].head().tolist())
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Available columns in GeoDataFrame: %s", gdf.columns.tolist())
+        logger.debug("Sample state names in GeoJSON: %s", gdf['STNAME'].head().tolist())
     
     # Make a copy of the original STNAME for reference
     gdf['ORIG_STNAME'] = gdf['STNAME']
     
     # Map state names from GeoJSON to match crime data
-    gdf['STNAME_mapped'] = gdf['STNAME'].apply(map_state_names)
-    
-    # Display sample of mapped names for debugging
-    print("\nSample mapped state names:")
-    print(gdf[['ORIG_STNAME', 'STNAME_mapped']].head(10).to_string())
+    gdf['STNAME_mapped'] = map_state_names_vec(gdf['STNAME'])
     
-    # Print all unique state names from both datasets for comparison
-    print("\nAll GeoJSON states:", sorted(gdf['STNAME'].unique().tolist()))
-    print("\nAll crime data states:", sorted(crime_data['States/UTs'].unique().tolist()))
+    # Log mapped names and all state names from both datasets for comparison
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Sample mapped state names:\n%s",
+                     gdf[['ORIG_STNAME', 'STNAME_mapped']].head(10).to_string())
+        logger.debug("All GeoJSON states: %s", sorted(gdf['STNAME'].unique().tolist()))
+        logger.debug("All crime data states: %s", sorted(crime_data['States/UTs'].unique().tolist()))
     
-    # Merge with crime data using the mapped names
-    print("\nMerging data...")
-    gdf = gdf.merge(crime_data, left_on='STNAME_mapped', right_on='States/UTs', how='left')
+    # Join crime data on its state index using the mapped names
+    crime_idx = crime_data.set_index('States/UTs')
+    crime_idx.index = crime_idx.index.astype(str)
+    gdf = gdf.join(crime_idx, on='STNAME_mapped', how='left')
     
     # Check for states that didn't merge correctly
-    missing_states = gdf[gdf['States/UTs'].isna()].copy()
+    missing_states = gdf[~gdf['STNAME_mapped'].isin(crime_idx.index)]
     if not missing_states.empty:
-        print("\nStates that didn't match during merge:")
-        print(missing_states[['ORIG_STNAME', 'STNAME_mapped']].drop_duplicates().to_string())
+        logger.warning("States that didn't match during merge:\n%s",
+                       missing_states[['ORIG_STNAME', 'STNAME_mapped']].drop_duplicates().to_string())
     
     # Fill missing values with 0 for numeric columns
-    numeric_cols = crime_data.select_dtypes(include=['int64', 'float64']).columns
+    numeric_cols = crime_data.select_dtypes(include='number').columns
     for col in numeric_cols:
         if col in gdf.columns:
             gdf[col] = gdf[col].fillna(0)
     
+    # Guarantee a clean NaN-free float column for colouring and serialization
+    gdf['Total_Crimes_Against_Women'] = gdf['Total_Crimes_Against_Women'].fillna(0).astype('float32')
+    
+    # Folium embeds every vertex in the HTML; simplify in WGS84 degrees first
+    if gdf.crs is not None and gdf.crs.to_epsg() != 4326:
+        gdf = gdf.to_crs(epsg=4326)
+    gdf['geometry'] = gdf.geometry.simplify(SIMPLIFY_TOLERANCE, preserve_topology=True)
+    
+    # Colour every state once here instead of interpolating per feature in Folium
+    gdf['_fill'] = _fill_colors(gdf['Total_Crimes_Against_Women'].to_numpy())
+    
+    return gdf, crime_data
+
+def create_enhanced_choropleth_map(prepared=None):
+    """Create an enhanced interactive choropleth map with additional features.
+    
+    Args:
+        prepared (tuple): Output of _prepare_data(); loaded if not given
+    """
+    if prepared is None:
+        prepared = _prepare_data()
+    if prepared is None:
+        return None
+    gdf, crime_data = prepared
+    
+    import folium
+    import branca.colormap as cm
+    from folium.plugins import Search, MiniMap, Fullscreen, MeasureControl
+    from folium.features import GeoJsonTooltip
+    
+    # Tooltip HTML needs the per-crime columns, which are dropped from the layer below
+    gdf = gdf.assign(_tooltip=create_enhanced_tooltips(gdf))
+    
+    # Folium serializes every property of every feature into the HTML, so keep
+    # only what the style, tooltip and popup read
+    layer_cols = [col for col in MAP_LAYER_COLUMNS if col in gdf.columns]
+    gdf = gdf[layer_cols + ['geometry']]
+    
     # Create a base map with better tile options
     m = folium.Map(
         location=[20.5937, 78.9629],  # Center of India
@@ -389,33 +564,20 @@ def create_enhanced_choropleth_map():
         attr='Map tiles by Stamen Design, under CC BY 3.0. Data by OpenStreetMap, under ODbL.'
     ).add_to(m)
     
-    # Create a colormap
-    max_crimes = gdf['Total_Crimes_Against_Women'].max()
-    colormap = cm.LinearColormap(
+    # Legend matching the precomputed per-state fill colours
+    colormap = cm.StepColormap(
         colors=COLOR_SCALE,
-        vmin=0,
-        vmax=max_crimes,
+        index=_color_bins(gdf['Total_Crimes_Against_Women'].max()).tolist(),
         caption='Total Crimes Against Women'
     )
     
     # Add colormap to the map
     colormap.add_to(m)
     
-    # Create a style function for the choropleth
+    # Fill colours were precomputed for every state in _prepare_data()
     def style_function(feature):
-        # Get the crime count, default to 0 if not found
-        crime_count = feature['properties'].get('Total_Crimes_Against_Women', 0)
-        if crime_count is None or pd.isna(crime_count):
-            crime_count = 0
-            
-        # Ensure crime_count is a number
-        try:
-            crime_count = float(crime_count)
-        except (ValueError, TypeError):
-            crime_count = 0
-            
         return {
-            'fillColor': colormap(crime_count),
+            'fillColor': feature['properties']['_fill'],
             'color': '#000000',
             'weight': 0.5,
             'fillOpacity': 0.7,
@@ -432,13 +594,11 @@ def create_enhanced_choropleth_map():
             'opacity': 0.5
         }
     
-    # Create tooltips with crime statistics
+    # Tooltips with crime statistics and the per-crime distribution bars
     tooltip = GeoJsonTooltip(
-        fields=['STNAME', 'Total_Crimes_Against_Women', 'Crime_Rate', 'Population'],
-        aliases=['State:', 'Total Crimes:', 'Crime Rate (per 100k):', 'Population:'],
-        localize=True,
+        fields=['_tooltip'],
         sticky=True,
-        labels=True,
+        labels=False,
         style=(
             "background-color: white;"
             "border: 1px solid #999999;"
@@ -606,35 +766,27 @@ def create_enhanced_choropleth_map():
     
     return output_file
 
-def create_choropleth_map():
-    """Create an interactive choropleth map of crime data by state."""
-    print("Creating choropleth map...")
+def create_choropleth_map(prepared=None):
+    """Create an interactive choropleth map of crime data by state.
     
-    # Load GeoJSON data
-    states_geojson = geo_data_dir / 'maps' / 'INDIA_STATES.geojson'
-    if not states_geojson.exists():
-        print(f"Error: GeoJSON file not found at {states_geojson}")
-        return
+    Args:
+        prepared (tuple): Output of _prepare_data(); loaded if not given
+    """
+    print("Creating choropleth map...")
     
-    # Load crime data
-    crime_data = load_crime_data()
-    if crime_data is None:
+    if prepared is None:
+        prepared = _prepare_data()
+    if prepared is None:
         print("No crime data available for mapping")
         return
+    india_states, crime_data = prepared
     
-    # Map state names to match GeoJSON
-    crime_data['State_Geo'] = crime_data['States/UTs'].apply(map_state_names)
-    print("\nSample of mapped state names:")
-    print(crime_data[['States/UTs', 'State_Geo']].head())
+    import folium
+    import branca.colormap as cm
     
-    # Load GeoJSON
-    india_states = load_geojson(states_geojson)
-    if india_states is None:
-        return
-    
-    # Print available GeoJSON properties for debugging
-    print("\nSample of GeoJSON state names:")
-    print(india_states[['STNAME', 'STCODE11']].head().to_string())
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Sample of mapped state names:\n%s",
+                     crime_data[['States/UTs', 'State_Geo']].head().to_string())
     
     # Create a base map centered on India
     m = folium.Map(
@@ -643,40 +795,13 @@ def create_choropleth_map():
         tiles='cartodbpositron'  # Light map style (no API key needed)
     )
     
-    # Create a choropleth map
-    choropleth = folium.Choropleth(
-        geo_data=india_states,
-        name='Crime Rate by State',
-        data=crime_data,
-        columns=['State_Geo', 'Total Crimes against Women'],  # Use the mapped state names and total crimes
-        key_on='feature.properties.STNAME',  # This must match the GeoJSON property name
-        fill_color='YlOrRd',
-        fill_opacity=0.7,
-        line_opacity=0.2,
-        legend_name='Total Crimes Against Women (2014)',
-        highlight=True,
-        reset=True
-    ).add_to(m)
-    
-    # Add labels to the choropleth
-    choropleth.geojson.add_child(
-        folium.features.GeoJsonTooltip(
-            fields=['STNAME'],
-            aliases=['State: '],
-            style=(
-                "background-color: white; color: #333333; font-family: arial; "
-                "font-size: 12px; padding: 8px; border-radius: 3px; box-shadow: 3px 3px 3px rgba(0, 0, 0, 0.2);"
-            ),
-            localize=True,
-            sticky=True
-        )
-    )
-    
-    # Add hover functionality
-    style_function = lambda x: {'fillColor': '#ffffff', 
-                               'color':'#000000', 
-                               'fillOpacity': 0.1, 
-                               'weight': 0.1}
+    # Style the already-merged states directly with their precomputed fill
+    # colours instead of letting folium.Choropleth re-join the crime data
+    style_function = lambda x: {'fillColor': x['properties']['_fill'],
+                               'color': '#000000',
+                               'fillOpacity': 0.7,
+                               'opacity': 0.2,
+                               'weight': 0.5}
     
     highlight_function = lambda x: {'fillColor': '#000000', 
                                    'color':'#000000', 
@@ -687,6 +812,8 @@ def create_choropleth_map():
     tooltip = folium.features.GeoJsonTooltip(
         fields=['STNAME'],  # Adjust based on your GeoJSON
         aliases=['State: '],
+        localize=True,
+        sticky=True,
         style=("""
             background-color: white;
             color: #333333;
@@ -699,14 +826,21 @@ def create_choropleth_map():
     )
     
     # Add GeoJSON layer with tooltips
-    geojson_layer = folium.features.GeoJson(
-        india_states,
+    folium.features.GeoJson(
+        india_states[['STNAME', '_fill', 'geometry']],
+        name='Crime Rate by State',
         style_function=style_function,
-        control=False,
         highlight_function=highlight_function,
         tooltip=tooltip
     ).add_to(m)
     
+    # Legend for the fill colours
+    cm.StepColormap(
+        colors=COLOR_SCALE,
+        index=_color_bins(india_states['Total_Crimes_Against_Women'].max()).tolist(),
+        caption='Total Crimes Against Women (2014)'
+    ).add_to(m)
+    
     # Add layer control
     folium.LayerControl().add_to(m)
     
@@ -736,23 +870,57 @@ def create_choropleth_map():
     
     return str(output_file)
 
+def build_state_tiles(prepared=None):
+    """Export the state layer as PMTiles; an explicit build step, not part of map creation.
+    
+    Args:
+        prepared (tuple): Output of _prepare_data(); loaded if not given
+        
+    Returns:
+        Path: The PMTiles archive, or None if the data or tippecanoe is unavailable
+    """
+    if prepared is None:
+        prepared = _prepare_data()
+    if prepared is None:
+        return None
+    gdf, _ = prepared
+    
+    layer_cols = [col for col in MAP_LAYER_COLUMNS if col in gdf.columns]
+    return export_state_tiles(gdf[layer_cols + ['geometry']])
+
 def main():
     """Main function to create and display the choropleth map."""
+    import argparse
+    import webbrowser
+    
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--export-tiles', action='store_true',
+                        help='build the PMTiles state layer with tippecanoe instead of the HTML map')
+    args = parser.parse_args()
+    
+    # Load and merge the data once; both map builders reuse it
+    prepared = _prepare_data()
+    
+    if args.export_tiles:
+        tiles = build_state_tiles(prepared)
+        if tiles:
+            print(f"State tiles written to: {tiles}")
+        return
+    
     # Create the enhanced choropleth map
-    output_file = create_enhanced_choropleth_map()
+    output_file = create_enhanced_choropleth_map(prepared)
     
     if output_file and output_file.exists():
         print(f"Enhanced choropleth map created successfully: {output_file}")
         # Open the map in the default web browser
-        import webbrowser
         webbrowser.open(f'file://{output_file.absolute()}')
     else:
         print("Failed to create enhanced choropleth map. Falling back to basic version.")
         # Fall back to basic version if enhanced fails
-        output_file = create_choropleth_map()
-        if output_file and output_file.exists():
+        output_file = create_choropleth_map(prepared)
+        if output_file and Path(output_file).exists():
             print(f"Basic choropleth map created: {output_file}")
-            webbrowser.open(f'file://{output_file.absolute()}')
+            webbrowser.open(f'file://{Path(output_file).absolute()}')
         else:
             print("Failed to create any choropleth map.")
 
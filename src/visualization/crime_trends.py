@@ -4,16 +4,77 @@ Crime Trend Analysis Visualization Module
 This module provides functions to analyze and visualize crime trends over time,
 including time series analysis, seasonal patterns, and trend forecasting.
 """
+import io
 import pandas as pd
 import numpy as np
 import plotly.graph_objects as go
+import plotly.io as pio
 from plotly.subplots import make_subplots
 import plotly.express as px
 from datetime import datetime, timedelta
-from typing import List, Dict, Optional, Tuple
+from typing import List, Dict, Optional, Tuple, Union
 from app.models.crime_data import CrimeReport, CrimeType
-from sqlalchemy import func, extract, and_
-from app.extensions import db
+from sqlalchemy import func, extract, and_, cast, DateTime, Interval
+from app.extensions import db, cache
+
+# Trend results for closed historical ranges are stable; ranges reaching today are not
+HISTORICAL_CACHE_TIMEOUT = 24 * 3600
+CURRENT_CACHE_TIMEOUT = 60
+
+# Postgres date_trunc field and generate_series step for each time unit
+TRUNC_UNITS = {'D': 'day', 'W': 'week', 'M': 'month', 'Q': 'quarter', 'Y': 'year'}
+PERIOD_STEPS = {'D': '1 day', 'W': '1 week', 'M': '1 month', 'Q': '3 months', 'Y': '1 year'}
+
+# Equivalent pandas resample rules (weeks start on Monday, as in date_trunc)
+RESAMPLE_RULES = {'D': 'D', 'W': 'W-MON', 'M': 'MS', 'Q': 'QS', 'Y': 'YS'}
+
+# SQL expressions built once per time unit rather than per request
+_PERIOD_EXPRS = {
+    time_unit: func.date_trunc(field, cast(CrimeReport.date_day, DateTime))
+    for time_unit, field in TRUNC_UNITS.items()
+}
+_STEP_EXPRS = {time_unit: cast(step, Interval) for time_unit, step in PERIOD_STEPS.items()}
+
+# Weekday labels in display order for heatmap rows
+DAY_ORDER = ['Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun']
+
+# Longest series sent to the browser; longer ones are downsampled with LTTB
+MAX_TREND_POINTS = 2000
+
+def _lttb_indices(x: np.ndarray, y: np.ndarray, n_out: int) -> Union[np.ndarray, slice]:
+    """Select points with Largest-Triangle-Three-Buckets downsampling.
+    
+    Args:
+        x: Numeric x values (datetimes as int64), ascending
+        y: Values to downsample
+        n_out: Number of points to keep
+        
+    Returns:
+        Sorted indices of the retained points, or a full slice when every point is
+        kept (so indexing with it returns a view rather than a copy)
+    """
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return slice(None)
+    
+    x = x.astype(np.float64)
+    y = y.astype(np.float64)
+    # First and last points are always kept; the rest is split into n_out - 2 buckets
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    indices = np.empty(n_out, dtype=np.int64)
+    indices[0], indices[-1] = 0, n - 1
+    
+    a = 0
+    for i in range(n_out - 2):
+        start, end = edges[i], edges[i + 1]
+        # Average of the next bucket (the last point for the final bucket)
+        next_end = edges[i + 2] if i + 2 < len(edges) else n
+        cx, cy = x[end:next_end].mean(), y[end:next_end].mean()
+        area = np.abs((x[a] - cx) * (y[start:end] - y[a]) - (x[a] - x[start:end]) * (cy - y[a]))
+        a = start + int(np.argmax(area))
+        indices[i + 1] = a
+    
+    return indices
 
 class CrimeTrendAnalyzer:
     """Analyze and visualize crime trends over time."""
@@ -28,47 +89,134 @@ class CrimeTrendAnalyzer:
         self.start_date = start_date or (datetime.utcnow() - timedelta(days=365))
         self.end_date = end_date or datetime.utcnow()
     
-    def get_crime_trends(self, time_unit: str = 'D', crime_type_id: Optional[int] = None) -> pd.DataFrame:
+    def get_crime_trends(self, time_unit: str = 'D', crime_type_id: Optional[int] = None,
+                         rolling_window: Optional[int] = None) -> pd.DataFrame:
         """Get crime counts aggregated by time unit.
         
         Args:
             time_unit: Time unit for aggregation ('D'=day, 'W'=week, 'M'=month, 'Q'=quarter, 'Y'=year)
             crime_type_id: Optional filter for specific crime type
+            rolling_window: If given, also return a moving average of crime_count over
+                this many periods (a window function on Postgres, pandas elsewhere)
             
         Returns:
-            DataFrame with columns: date, crime_count
+            DataFrame with columns: date, crime_count (and rolling_avg if requested)
         """
-        # Base query
-        query = db.session.query(
-            func.date_trunc(time_unit, CrimeReport.date_occurred).label('date'),
+        # The query only depends on calendar days, so key the cache on those
+        start_day, end_day = self.start_date.date(), self.end_date.date()
+        cache_key = f"crime_trends:{start_day}:{end_day}:{time_unit}:{crime_type_id}:{rolling_window}"
+        cached = cache.get(cache_key)
+        if cached is not None:
+            return pd.read_feather(io.BytesIO(cached))
+        
+        if db.engine.dialect.name == 'postgresql':
+            df = self._query_period_trends(start_day, end_day, time_unit, crime_type_id, rolling_window)
+        else:
+            df = self._resample_daily_trends(start_day, end_day, time_unit, crime_type_id, rolling_window)
+        
+        # Store as Arrow IPC bytes rather than a pickled DataFrame
+        buffer = io.BytesIO()
+        df.to_feather(buffer)
+        timeout = CURRENT_CACHE_TIMEOUT if end_day >= datetime.utcnow().date() else HISTORICAL_CACHE_TIMEOUT
+        cache.set(cache_key, buffer.getvalue(), timeout=timeout)
+        
+        return df
+    
+    def _query_period_trends(self, start_day, end_day, time_unit: str,
+                             crime_type_id: Optional[int],
+                             rolling_window: Optional[int]) -> pd.DataFrame:
+        """Aggregate, zero-fill and smooth the trend in a single Postgres query.
+        
+        Uses date_trunc, generate_series and a window AVG, none of which SQLite has.
+        """
+        unit = TRUNC_UNITS[time_unit]
+        
+        # Reported counts per period; grouping and filtering on the stored date_day
+        # column lets Postgres walk the (date_day, crime_type_id) index instead of
+        # truncating every date_occurred value
+        period = _PERIOD_EXPRS[time_unit]
+        counts = db.session.query(
+            period.label('date'),
             func.count(CrimeReport.id).label('crime_count')
         ).filter(
-            CrimeReport.date_occurred.between(self.start_date, self.end_date)
+            CrimeReport.date_day.between(start_day, end_day)
         )
         
         # Apply filters
         if crime_type_id is not None:
-            query = query.filter(CrimeReport.crime_type_id == crime_type_id)
+            counts = counts.filter(CrimeReport.crime_type_id == crime_type_id)
         
         # Group by time unit
-        query = query.group_by('date').order_by('date')
-        
-        # Execute query and convert to DataFrame
-        results = query.all()
-        df = pd.DataFrame(results, columns=['date', 'crime_count'])
-        
-        # Fill in missing dates with 0 counts
-        if not df.empty:
-            date_range = pd.date_range(
-                start=df['date'].min(),
-                end=df['date'].max(),
-                freq=time_unit
-            )
-            df = df.set_index('date').reindex(date_range, fill_value=0).reset_index()
-            df = df.rename(columns={'index': 'date'})
+        counts = counts.group_by(period).subquery()
+        
+        # Every period in the range, so periods without reports come back as 0
+        # without a reindex in pandas
+        calendar = db.session.query(
+            func.generate_series(
+                func.date_trunc(unit, cast(start_day, DateTime)),
+                func.date_trunc(unit, cast(end_day, DateTime)),
+                _STEP_EXPRS[time_unit]
+            ).label('date')
+        ).subquery()
+        
+        crime_count = func.coalesce(counts.c.crime_count, 0)
+        columns = [calendar.c.date, crime_count.label('crime_count')]
+        if rolling_window:
+            # Moving average over the zero-filled periods, evaluated in the same query
+            columns.append(func.avg(crime_count).over(
+                order_by=calendar.c.date,
+                rows=(-(rolling_window - 1), 0)
+            ).label('rolling_avg'))
+        
+        query = db.session.query(*columns).select_from(calendar).outerjoin(
+            counts, counts.c.date == calendar.c.date
+        ).order_by(calendar.c.date)
+        
+        # Execute on a server-side cursor; the option is scoped to this statement so
+        # the session's connection keeps its default buffered cursors
+        result = db.session.execute(query.statement, execution_options={'stream_results': True})
+        df = pd.DataFrame.from_records(result, columns=list(result.keys()))
+        if rolling_window:
+            # AVG over integers comes back as NUMERIC (Decimal)
+            df['rolling_avg'] = df['rolling_avg'].astype(float)
         
         return df
     
+    def _resample_daily_trends(self, start_day, end_day, time_unit: str,
+                               crime_type_id: Optional[int],
+                               rolling_window: Optional[int]) -> pd.DataFrame:
+        """Aggregate the trend on databases without date_trunc/generate_series (SQLite).
+        
+        Reports are counted per date_day in SQL; zero-filling, period resampling and
+        the moving average happen in pandas.
+        """
+        daily = db.session.query(
+            CrimeReport.date_day,
+            func.count(CrimeReport.id)
+        ).filter(
+            CrimeReport.date_day.between(start_day, end_day)
+        )
+        if crime_type_id is not None:
+            daily = daily.filter(CrimeReport.crime_type_id == crime_type_id)
+        rows = daily.group_by(CrimeReport.date_day).all()
+        
+        counts = pd.Series(
+            [count for _, count in rows],
+            index=pd.to_datetime([day for day, _ in rows]),
+            dtype=np.int64
+        )
+        calendar = pd.date_range(start_day, end_day, freq='D')
+        # Periods are labelled by their first day, like date_trunc
+        periods = counts.reindex(calendar, fill_value=0).resample(
+            RESAMPLE_RULES[time_unit], closed='left', label='left'
+        ).sum()
+        
+        df = periods.rename_axis('date').reset_index(name='crime_count')
+        if rolling_window:
+            # Same frame as the SQL window: up to rolling_window trailing periods
+            df['rolling_avg'] = df['crime_count'].rolling(rolling_window, min_periods=1).mean()
+        return df
+    
     def plot_trend(self, time_unit: str = 'W', crime_type_id: Optional[int] = None) -> go.Figure:
         """Create an interactive trend plot of crime data.
         
@@ -79,7 +227,10 @@ class CrimeTrendAnalyzer:
         Returns:
             Plotly Figure object
         """
-        df = self.get_crime_trends(time_unit, crime_type_id)
+        df = self.get_crime_trends(time_unit, crime_type_id, rolling_window=7)
+        # The series is zero-filled, so "no data" means no reports in any period
+        if not df['crime_count'].any():
+            return go.Figure(layout=dict(title='No data', template='plotly_white'))
         
         # Get crime type name for title
         crime_type = None
@@ -89,22 +240,30 @@ class CrimeTrendAnalyzer:
         # Create figure
         fig = go.Figure()
         
-        # Add main trend line
-        fig.add_trace(go.Scatter(
-            x=df['date'],
-            y=df['crime_count'],
+        # Long daily ranges are downsampled server-side so the browser draws at most
+        # MAX_TREND_POINTS per trace
+        dates = df['date'].to_numpy(dtype='datetime64[ns]', copy=False)
+        date_ns = dates.view(np.int64)
+        counts = df['crime_count'].to_numpy(copy=False)
+        keep = _lttb_indices(date_ns, counts, MAX_TREND_POINTS)
+        
+        # Add main trend line (WebGL)
+        fig.add_trace(go.Scattergl(
+            x=dates[keep],
+            y=counts[keep],
             mode='lines+markers',
             name='Crime Count',
             line=dict(color='#1f77b4', width=2),
-            marker=dict(size=6, color='#1f77b4')
+            marker=dict(size=4, color='#1f77b4')
         ))
         
-        # Add rolling average (7-period)
+        # Add rolling average (7-period, computed in the trend query)
         if len(df) > 7:
-            df['rolling_avg'] = df['crime_count'].rolling(window=7, min_periods=1).mean()
-            fig.add_trace(go.Scatter(
-                x=df['date'],
-                y=df['rolling_avg'],
+            rolling = df['rolling_avg'].to_numpy(dtype=np.float64, copy=False)
+            keep = _lttb_indices(date_ns, rolling, MAX_TREND_POINTS)
+            fig.add_trace(go.Scattergl(
+                x=dates[keep],
+                y=rolling[keep],
                 mode='lines',
                 name='7-Period Moving Avg',
                 line=dict(color='#ff7f0e', width=3, dash='dash')
@@ -125,6 +284,7 @@ class CrimeTrendAnalyzer:
             xaxis_title='Date',
             yaxis_title='Number of Crimes',
             template='plotly_white',
+            plot_bgcolor='white',
             hovermode='x unified',
             legend=dict(
                 orientation='h',
@@ -152,6 +312,26 @@ class CrimeTrendAnalyzer:
         
         return fig
     
+    def plot_trend_json(self, time_unit: str = 'W', crime_type_id: Optional[int] = None) -> str:
+        """Serialized form of plot_trend(), cached so repeat requests skip figure building.
+        
+        Args:
+            time_unit: Time unit for aggregation
+            crime_type_id: Optional filter for specific crime type
+            
+        Returns:
+            Plotly figure JSON string
+        """
+        start_day, end_day = self.start_date.date(), self.end_date.date()
+        cache_key = f"crime_trend_json:{start_day}:{end_day}:{time_unit}:{crime_type_id}"
+        fig_json = cache.get(cache_key)
+        if fig_json is None:
+            fig = self.plot_trend(time_unit, crime_type_id)
+            fig_json = pio.to_json(fig, validate=False, pretty=False)
+            timeout = CURRENT_CACHE_TIMEOUT if end_day >= datetime.utcnow().date() else HISTORICAL_CACHE_TIMEOUT
+            cache.set(cache_key, fig_json, timeout=timeout)
+        return fig_json
+    
     def plot_seasonal_decomposition(self, crime_type_id: Optional[int] = None) -> go.Figure:
         """Create a seasonal decomposition plot of crime data.
         
@@ -161,21 +341,35 @@ class CrimeTrendAnalyzer:
         Returns:
             Plotly Figure object with subplots for trend, seasonality, and residuals
         """
-        from statsmodels.tsa.seasonal import seasonal_decompose
-        
-        # Get daily data
+        # Get daily data (already zero-filled to a complete date range)
         df = self.get_crime_trends('D', crime_type_id)
         
-        # Ensure we have a complete date range
-        date_range = pd.date_range(start=df['date'].min(), end=df['date'].max(), freq='D')
-        df = df.set_index('date').reindex(date_range, fill_value=0).reset_index()
+        # Additive decomposition with weekly seasonality, on contiguous float32 arrays
+        period = 7
+        dates = df['date'].to_numpy(dtype='datetime64[ns]', copy=False)
+        observed = np.ascontiguousarray(df['crime_count'].to_numpy(dtype=np.float32))
+        if len(observed) < 2 * period:
+            raise ValueError(f"Seasonal decomposition needs at least {2 * period} days of data")
         
-        # Perform seasonal decomposition (assumes weekly seasonality with period=7)
-        result = seasonal_decompose(
-            df.set_index('index')['crime_count'],
-            model='additive',
-            period=7  # Weekly seasonality
+        # Trend: centred 7-day moving average; the first and last period // 2 days
+        # have no full window and are left as NaN (as statsmodels does)
+        half = period // 2
+        trend = np.full(len(observed), np.nan, dtype=np.float32)
+        trend[half:len(observed) - half] = np.convolve(
+            observed, np.full(period, 1.0 / period, dtype=np.float32), mode='valid'
         )
+        detrended = observed - trend
+        
+        # Seasonal: mean detrended value per weekday position (ignoring the NaN
+        # edges), centred on zero
+        phase = np.arange(len(observed)) % period
+        valid = ~np.isnan(detrended)
+        phase_means = (np.bincount(phase[valid], weights=detrended[valid], minlength=period) /
+                       np.bincount(phase[valid], minlength=period)).astype(np.float32)
+        phase_means -= phase_means.mean()
+        seasonal = phase_means[phase]
+        # Residual reuses the detrended buffer instead of allocating another series
+        resid = np.subtract(detrended, seasonal, out=detrended)
         
         # Create subplots
         fig = make_subplots(
@@ -187,19 +381,19 @@ class CrimeTrendAnalyzer:
         
         # Add traces
         fig.add_trace(
-            go.Scatter(x=result.observed.index, y=result.observed, name='Observed'),
+            go.Scattergl(x=dates, y=observed, name='Observed'),
             row=1, col=1
         )
         fig.add_trace(
-            go.Scatter(x=result.trend.index, y=result.trend, name='Trend'),
+            go.Scattergl(x=dates, y=trend, name='Trend'),
             row=2, col=1
         )
         fig.add_trace(
-            go.Scatter(x=result.seasonal.index, y=result.seasonal, name='Seasonal'),
+            go.Scattergl(x=dates, y=seasonal, name='Seasonal'),
             row=3, col=1
         )
         fig.add_trace(
-            go.Scatter(x=result.resid.index, y=result.resid, name='Residual'),
+            go.Scattergl(x=dates, y=resid, name='Residual'),
             row=4, col=1
         )
         
@@ -221,7 +415,8 @@ class CrimeTrendAnalyzer:
             ),
             showlegend=False,
             height=800,
-            template='plotly_white'
+            template='plotly_white',
+            plot_bgcolor='white'
         )
         
         # Update y-axis titles
@@ -250,20 +445,25 @@ class CrimeTrendAnalyzer:
         Returns:
             Plotly Figure object with heatmap
         """
-        # Pivot the data for heatmap
-        pivot_df = df.pivot_table(
-            index=y_col,
-            columns=x_col,
-            values=z_col,
-            aggfunc='sum',
-            fill_value=0
-        )
+        # Scatter-add values into a dense (y, x) grid instead of a hashed pivot_table
+        x_labels, x_idx = np.unique(df[x_col].to_numpy(), return_inverse=True)
+        y_values = df[y_col]
+        if y_values.isin(DAY_ORDER).all():
+            # Weekday names keep calendar order rather than alphabetical
+            y_labels = np.array(DAY_ORDER)
+            y_idx = pd.Categorical(y_values, categories=DAY_ORDER).codes
+        else:
+            y_labels, y_idx = np.unique(y_values.to_numpy(), return_inverse=True)
+        
+        values = df[z_col].to_numpy()
+        z = np.zeros((len(y_labels), len(x_labels)), dtype=values.dtype)
+        np.add.at(z, (y_idx, x_idx), values)
         
         # Create heatmap
         fig = go.Figure(data=go.Heatmap(
-            z=pivot_df.values,
-            x=pivot_df.columns,
-            y=pivot_df.index,
+            z=z,
+            x=x_labels,
+            y=y_labels,
             colorscale='Viridis',
             colorbar=dict(title='Number of Crimes')
         ))
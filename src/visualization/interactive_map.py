@@ -6,9 +6,11 @@ It uses local GeoJSON files for state boundaries and overlays crime data.
 """
 import os
 import json
+from functools import lru_cache
 import folium
+import orjson
 import pandas as pd
-import geopandas as gpd
+import pyarrow.csv as pacsv
 from pathlib import Path
 
 # Set up paths
@@ -18,12 +20,20 @@ geo_data_dir = data_dir / 'raw' / 'geographic'
 output_dir = project_root / 'reports' / 'maps'
 output_dir.mkdir(parents=True, exist_ok=True)
 
+@lru_cache(maxsize=None)
+def _load_geojson(path):
+    """Parse a GeoJSON file once with orjson and reuse the resulting dict."""
+    return orjson.loads(Path(path).read_bytes())
+
 def create_interactive_map():
     """Create an interactive map of India with crime data visualization."""
     print("Creating interactive map...")
     
-    # Load India states GeoJSON
-    states_geojson = geo_data_dir / 'maps' / 'INDIA_STATES.geojson'
+    # Load India states GeoJSON, preferring the simplified copy built by
+    # src/data/build_simplified_states.py
+    states_geojson = geo_data_dir / 'maps' / 'INDIA_STATES_simplified.geojson'
+    if not states_geojson.exists():
+        states_geojson = geo_data_dir / 'maps' / 'INDIA_STATES.geojson'
     if not states_geojson.exists():
         print(f"Error: GeoJSON file not found at {states_geojson}")
         return
@@ -32,12 +42,17 @@ def create_interactive_map():
     crime_data_path = data_dir / 'raw' / 'ncrb' / 'district_wise' / 'vulnerable_groups' / '42_District_wise_crimes_committed_against_women_2014.csv'
     
     try:
-        # Read the GeoJSON file
-        india_states = gpd.read_file(states_geojson)
+        # Read the GeoJSON file as a plain dict; folium serializes it without geopandas
+        india_states = _load_geojson(states_geojson)
         
         # Read crime data (example - you'll need to adjust this based on your data)
         if crime_data_path.exists():
-            crime_data = pd.read_csv(crime_data_path, encoding='latin1')
+            # Multithreaded Arrow reader; Arrow-backed dtypes avoid a copy into NumPy
+            table = pacsv.read_csv(
+                crime_data_path,
+                read_options=pacsv.ReadOptions(encoding='latin1', block_size=8 << 20)
+            )
+            crime_data = table.to_pandas(types_mapper=pd.ArrowDtype)
             print(f"Loaded crime data with {len(crime_data)} records")
             # Here you would merge crime data with geo data based on common keys
             # For now, we'll just use the GeoJSON data
@@ -51,7 +66,8 @@ def create_interactive_map():
         
         # Print available fields for debugging
         print("\nAvailable fields in GeoJSON:")
-        print(india_states.columns.tolist())
+        features = india_states.get('features', [])
+        print(list(features[0]['properties']) if features else [])
         
         # Add state boundaries with hover information
         folium.GeoJson(
@@ -82,7 +98,7 @@ def create_interactive_map():
         
         # Save the map to an HTML file
         output_file = output_dir / 'india_crime_map.html'
-        m.save(str(output_file))
+        output_file.write_bytes(m.get_root().render().encode('utf-8'))
         print(f"Interactive map saved to: {output_file}")
         
         return str(output_file)
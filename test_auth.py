@@ -5,9 +5,19 @@ Test authentication system and debug login issues
 
 import os
 import sys
+import time
 sys.path.append(os.path.dirname(__file__))
 
 from werkzeug.security import check_password_hash, generate_password_hash
+from argon2.exceptions import InvalidHash, VerificationError
+from app.models.user import password_hasher
+
+def verify_argon2(password_hash, password):
+    """Verify an argon2 hash, returning False instead of raising on mismatch"""
+    try:
+        return password_hasher.verify(password_hash, password)
+    except (VerificationError, InvalidHash):
+        return False
 
 def test_password_hashing():
     """Test password hashing and verification"""
@@ -15,14 +25,24 @@ def test_password_hashing():
     
     test_password = "admin123"
     
-    # Test different hashing methods
-    methods = ['pbkdf2:sha256', 'pbkdf2:sha1', 'scrypt', 'argon2']
+    # Test different hashing methods: werkzeug's methods and argon2-cffi (used by the app)
+    methods = {
+        'pbkdf2:sha256': (lambda pwd: generate_password_hash(pwd, method='pbkdf2:sha256'), check_password_hash),
+        'pbkdf2:sha1': (lambda pwd: generate_password_hash(pwd, method='pbkdf2:sha1'), check_password_hash),
+        'scrypt': (lambda pwd: generate_password_hash(pwd, method='scrypt'), check_password_hash),
+        'argon2id (argon2-cffi)': (password_hasher.hash, verify_argon2),
+    }
     
-    for method in methods:
+    for method, (hash_func, verify_func) in methods.items():
         try:
-            hashed = generate_password_hash(test_password, method=method)
-            verified = check_password_hash(hashed, test_password)
-            print(f"✅ {method}: Hash created and verified successfully")
+            start = time.perf_counter()
+            hashed = hash_func(test_password)
+            hash_ms = (time.perf_counter() - start) * 1000
+            start = time.perf_counter()
+            verified = verify_func(hashed, test_password)
+            verify_ms = (time.perf_counter() - start) * 1000
+            status = "✅" if verified else "❌"
+            print(f"{status} {method}: hash {hash_ms:.1f} ms, verify {verify_ms:.1f} ms")
         except Exception as e:
             print(f"❌ {method}: Error - {e}")
 
@@ -44,7 +64,8 @@ def test_database_users():
         # Define User model inline to avoid circular imports
         from datetime import datetime
         from flask_login import UserMixin
-        from werkzeug.security import generate_password_hash, check_password_hash
+        from sqlalchemy import select
+        from sqlalchemy.orm import load_only
         
         class User(UserMixin, db.Model):
             __tablename__ = 'users'
@@ -61,11 +82,17 @@ def test_database_users():
             created_at = db.Column(db.DateTime, default=datetime.utcnow)
             
             def verify_password(self, password):
-                return check_password_hash(self.password_hash, password)
+                if not self.password_hash.startswith('$argon2'):
+                    return check_password_hash(self.password_hash, password)
+                return verify_argon2(self.password_hash, password)
         
         with app.app_context():
-            # Query users
-            users = User.query.all()
+            # Query users, loading only the columns printed and checked below
+            users = db.session.scalars(
+                select(User).options(load_only(
+                    User.email, User.username, User.is_active, User.is_admin, User.password_hash
+                ))
+            ).all()
             print(f"Found {len(users)} users in database:")
             
             for user in users:
@@ -94,12 +121,27 @@ def test_manual_verification():
     
     # Test with known hash
     test_password = "admin123"
-    test_hash = generate_password_hash(test_password, method='pbkdf2:sha256')
+    test_hash = password_hasher.hash(test_password)
     
     print(f"Original password: {test_password}")
     print(f"Generated hash: {test_hash}")
-    print(f"Verification result: {check_password_hash(test_hash, test_password)}")
-    print(f"Wrong password test: {check_password_hash(test_hash, 'wrongpassword')}")
+    print(f"Verification result: {verify_argon2(test_hash, test_password)}")
+    print(f"Wrong password test: {verify_argon2(test_hash, 'wrongpassword')}")
+
+def test_legacy_hash_upgraded():
+    """A legacy pbkdf2 hash is replaced by argon2id after a successful check"""
+    print("\n🔄 Legacy hash upgrade test...")
+    from app.models.user import User
+    
+    user = User(email='legacy@crimesense.com', username='legacy',
+                password_hash=generate_password_hash('admin123', method='pbkdf2:sha256'))
+    
+    assert not user.verify_password('wrongpassword')
+    assert user.password_hash.startswith('pbkdf2:'), "Hash changed after a failed check"
+    assert user.verify_password('admin123')
+    assert user.password_hash.startswith('$argon2id$'), "Legacy hash was not upgraded"
+    assert user.verify_password('admin123')
+    print(f"✅ Upgraded hash: {user.password_hash[:30]}...")
 
 if __name__ == '__main__':
     print("🔍 Authentication System Debug Tool")
@@ -107,4 +149,5 @@ if __name__ == '__main__':
     
     test_password_hashing()
     test_manual_verification()
+    test_legacy_hash_upgraded()
     test_database_users()
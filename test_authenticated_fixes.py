@@ -6,312 +6,94 @@ Tests with proper login authentication
 
 import sys
 import os
-from datetime import datetime
+
+import pytest
 
 # Add the current directory to Python path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-def create_authenticated_client():
-    """Create a test client with authenticated session"""
-    from app import create_app
-    from app.models.user import User
-    from app.extensions import db
-    
-    app = create_app()
-    client = app.test_client()
-    
-    with app.app_context():
-        # Ensure demo user exists
-        demo_user = User.query.filter_by(email='admin@crimesense.com').first()
-        if not demo_user:
-            demo_user = User(
-                email='admin@crimesense.com',
-                username='admin',
-                first_name='Admin',
-                last_name='User',
-                password='admin123',
-                is_active=True,
-                is_admin=True
-            )
-            db.session.add(demo_user)
-            db.session.commit()
-    
-    # Login
-    login_data = {
-        'email': 'admin@crimesense.com',
-        'password': 'admin123',
-        'remember': False
-    }
-    
-    response = client.post('/auth/login', data=login_data, follow_redirects=True)
-    print(f"Login status: {response.status_code}")
-    
-    return app, client
-
-def test_chennai_map_authenticated():
-    """Test Chennai map with authentication"""
-    print("🗺️ Testing Chennai Map (Authenticated)...")
-    
-    try:
-        app, client = create_authenticated_client()
-        
-        # Test Chennai city map route
-        response = client.get('/map/city/tamil-nadu/chennai')
-        print(f"Chennai map response: {response.status_code}")
-        
-        if response.status_code == 200:
-            content = response.data.decode('utf-8')
-            
-            # Check for essential components
-            checks = [
-                ('loadCityGeoJSON', 'GeoJSON loading function'),
-                ('addCityInfrastructure', 'Infrastructure function'),
-                ('markercluster', 'Clustering support'),
-                ('Chennai', 'City reference')
-            ]
-            
-            for check, description in checks:
-                if check in content:
-                    print(f"✅ {description} found")
-                else:
-                    print(f"⚠️ {description} missing")
-            
-            return True
-        else:
-            print(f"❌ Chennai map failed: {response.status_code}")
-            return False
-            
-    except Exception as e:
-        print(f"❌ Chennai map test failed: {e}")
-        return False
-
-def test_ai_predictions_authenticated():
-    """Test AI predictions with authentication"""
-    print("\n🧠 Testing AI Predictions (Authenticated)...")
-    
-    try:
-        app, client = create_authenticated_client()
-        
-        response = client.get('/ai-predictions')
-        print(f"AI predictions response: {response.status_code}")
-        
-        if response.status_code == 200:
-            content = response.data.decode('utf-8')
-            
-            # Check for key components
-            checks = [
-                ('AI-Powered Crime Predictions', 'Page title'),
-                ('ai-dashboard-body', 'Dashboard styling'),
-                ('Chart.js', 'Chart library'),
-                ('CRIMESENSE', 'Base template integration')
-            ]
-            
-            for check, description in checks:
-                if check in content:
-                    print(f"✅ {description} found")
-                else:
-                    print(f"⚠️ {description} missing")
-            
-            return True
-        else:
-            print(f"❌ AI predictions failed: {response.status_code}")
-            return False
-            
-    except Exception as e:
-        print(f"❌ AI predictions test failed: {e}")
-        return False
-
-def test_pattern_analysis_authenticated():
-    """Test pattern analysis with authentication"""
-    print("\n📊 Testing Pattern Analysis (Authenticated)...")
-    
-    try:
-        app, client = create_authenticated_client()
-        
-        response = client.get('/pattern-analysis')
-        print(f"Pattern analysis response: {response.status_code}")
-        
-        if response.status_code == 200:
-            content = response.data.decode('utf-8')
-            
-            # Check for key components
-            checks = [
-                ('AI Crime Pattern Analysis', 'Page title'),
-                ('loadPatternAnalysis', 'Data loading function'),
-                ('refreshAnalysis', 'Refresh function'),
-                ('/api/pattern-analysis', 'API endpoint')
-            ]
-            
-            for check, description in checks:
-                if check in content:
-                    print(f"✅ {description} found")
-                else:
-                    print(f"⚠️ {description} missing")
-            
-            return True
-        else:
-            print(f"❌ Pattern analysis failed: {response.status_code}")
-            return False
-            
-    except Exception as e:
-        print(f"❌ Pattern analysis test failed: {e}")
-        return False
+from page_checks import build_matcher
 
-def test_advanced_map_authenticated():
-    """Test advanced map with authentication"""
-    print("\n🚀 Testing Advanced Map (Authenticated)...")
-    
-    try:
-        app, client = create_authenticated_client()
-        
-        response = client.get('/advanced-map')
-        print(f"Advanced map response: {response.status_code}")
-        
-        if response.status_code == 200:
-            content = response.data.decode('utf-8')
-            
-            # Check for advanced features
-            checks = [
-                ('Advanced Crime Hotspot Map', 'Page title'),
-                ('markercluster', 'Clustering support'),
-                ('heatmap', 'Heatmap functionality'),
-                ('real-time', 'Real-time features')
-            ]
-            
-            for check, description in checks:
-                if check in content:
-                    print(f"✅ {description} found")
-                else:
-                    print(f"⚠️ {description} missing")
-            
-            return True
-        else:
-            print(f"❌ Advanced map failed: {response.status_code}")
-            return False
-            
-    except Exception as e:
-        print(f"❌ Advanced map test failed: {e}")
-        return False
+# Tokens each page must contain, matched in one pass over the raw response bytes
+CHENNAI_MAP_CHECKS = [
+    ('loadCityGeoJSON', 'GeoJSON loading function'),
+    ('addCityInfrastructure', 'Infrastructure function'),
+    ('markercluster', 'Clustering support'),
+    ('Chennai', 'City reference')
+]
+AI_PREDICTIONS_CHECKS = [
+    ('AI-Powered Crime Predictions', 'Page title'),
+    ('ai-dashboard-body', 'Dashboard styling'),
+    ('Chart.js', 'Chart library'),
+    ('CRIMESENSE', 'Base template integration')
+]
+PATTERN_ANALYSIS_CHECKS = [
+    ('AI Crime Pattern Analysis', 'Page title'),
+    ('loadPatternAnalysis', 'Data loading function'),
+    ('refreshAnalysis', 'Refresh function'),
+    ('/api/pattern-analysis', 'API endpoint')
+]
+ADVANCED_MAP_CHECKS = [
+    ('Advanced Crime Hotspot Map', 'Page title'),
+    ('markercluster', 'Clustering support'),
+    ('heatmap', 'Heatmap functionality'),
+    ('real-time', 'Real-time features')
+]
+BASIC_MAP_CHECKS = [
+    ('markercluster', 'Clustering integration'),
+    ('clusterGroup', 'Cluster group'),
+    ('addInfrastructureMarker', 'Infrastructure markers'),
+    ('crime markers disabled', 'No crime markers')
+]
+PAGE_MATCHER = build_matcher(
+    token.encode() for checks in (
+        CHENNAI_MAP_CHECKS, AI_PREDICTIONS_CHECKS, PATTERN_ANALYSIS_CHECKS,
+        ADVANCED_MAP_CHECKS, BASIC_MAP_CHECKS
+    ) for token, _ in checks
+)
 
-def test_basic_map_authenticated():
-    """Test basic interactive map with authentication"""
-    print("\n🗺️ Testing Basic Interactive Map (Authenticated)...")
-    
-    try:
-        app, client = create_authenticated_client()
-        
-        response = client.get('/map')
-        print(f"Basic map response: {response.status_code}")
-        
-        if response.status_code == 200:
-            content = response.data.decode('utf-8')
-            
-            # Check for integrated features
-            checks = [
-                ('markercluster', 'Clustering integration'),
-                ('clusterGroup', 'Cluster group'),
-                ('addInfrastructureMarker', 'Infrastructure markers'),
-                ('crime markers disabled', 'No crime markers')
-            ]
-            
-            for check, description in checks:
-                if check in content:
-                    print(f"✅ {description} found")
-                else:
-                    print(f"⚠️ {description} missing")
-            
-            return True
-        else:
-            print(f"❌ Basic map failed: {response.status_code}")
-            return False
-            
-    except Exception as e:
-        print(f"❌ Basic map test failed: {e}")
-        return False
+# Logged-in pages come from conftest's authed_client, which writes the session
+# directly; the /auth/login form itself is covered by test_user_flow.py
+@pytest.fixture(scope="session")
+def page_cache(authed_client):
+    """Fetch a page once per session and reuse its (status, body bytes) afterwards"""
+    cache = {}
+    
+    def fetch(url):
+        if url not in cache:
+            response = authed_client.get(url)
+            # Raw body bytes: the token checks run on bytes, so skip the UTF-8 decode
+            cache[url] = (response.status_code, response.data)
+        return cache[url]
+    
+    return fetch
 
-def test_api_endpoints_authenticated():
-    """Test API endpoints with authentication"""
-    print("\n🔌 Testing API Endpoints (Authenticated)...")
-    
-    try:
-        app, client = create_authenticated_client()
-        
-        api_endpoints = [
-            ('/api/pattern-analysis', 'Pattern Analysis API'),
-            ('/api/crime-stats', 'Crime Statistics API')
-        ]
-        
-        for endpoint, name in api_endpoints:
-            response = client.get(endpoint)
-            print(f"{name} response: {response.status_code}")
-            
-            if response.status_code == 200:
-                try:
-                    data = response.get_json()
-                    if data and ('success' in data or 'data' in data):
-                        print(f"✅ {name} returns valid JSON")
-                    else:
-                        print(f"⚠️ {name} returns unexpected format")
-                except:
-                    print(f"⚠️ {name} returns non-JSON response")
-            else:
-                print(f"❌ {name} failed: {response.status_code}")
-        
-        return True
-        
-    except Exception as e:
-        print(f"❌ API endpoints test failed: {e}")
-        return False
+@pytest.mark.parametrize('url,checks', [
+    pytest.param('/map/city/tamil-nadu/chennai', CHENNAI_MAP_CHECKS, id='chennai_map'),
+    pytest.param('/ai-predictions', AI_PREDICTIONS_CHECKS, id='ai_predictions'),
+    pytest.param('/pattern-analysis', PATTERN_ANALYSIS_CHECKS, id='pattern_analysis'),
+    pytest.param('/advanced-map', ADVANCED_MAP_CHECKS, id='advanced_map'),
+    pytest.param('/map', BASIC_MAP_CHECKS, id='basic_map'),
+])
+def test_page_authenticated(page_cache, url, checks):
+    """Test that an authenticated page renders with all of its expected components"""
+    status, content = page_cache(url)
+    assert status == 200, f"{url} failed: {status}"
+    
+    found = PAGE_MATCHER(content, (check.encode() for check, _ in checks))
+    missing = [description for check, description in checks if check.encode() not in found]
+    assert not missing, f"{url} is missing: {', '.join(missing)}"
 
-def run_authenticated_test():
-    """Run all authenticated tests"""
-    print("🔐 Crime Hotspot Application - Authenticated Fix Verification")
-    print("=" * 65)
-    print(f"📅 Test started at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-    print()
-    
-    tests = [
-        test_chennai_map_authenticated,
-        test_basic_map_authenticated,
-        test_advanced_map_authenticated,
-        test_ai_predictions_authenticated,
-        test_pattern_analysis_authenticated,
-        test_api_endpoints_authenticated
-    ]
-    
-    passed_tests = 0
-    total_tests = len(tests)
-    
-    for test in tests:
-        try:
-            if test():
-                passed_tests += 1
-                print(f"✅ {test.__name__} PASSED")
-            else:
-                print(f"❌ {test.__name__} FAILED")
-        except Exception as e:
-            print(f"💥 {test.__name__} CRASHED: {e}")
-        print()
-    
-    print("=" * 65)
-    print(f"📊 Authenticated Test Results: {passed_tests}/{total_tests} tests passed")
-    
-    if passed_tests == total_tests:
-        print("🎉 ALL AUTHENTICATED TESTS PASSED!")
-        print("✅ Chennai map loading works")
-        print("✅ Advanced map integration successful")
-        print("✅ AI predictions template fixed")
-        print("✅ Pattern analysis functional")
-        print("✅ API endpoints working")
-        print("🚀 All fixes verified and working!")
-    else:
-        print(f"⚠️ {total_tests - passed_tests} tests failed.")
-        print("🔧 Some issues may remain.")
-    
-    print(f"📅 Test completed at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-    
-    return passed_tests == total_tests
+@pytest.mark.parametrize('endpoint,name', [
+    pytest.param('/api/pattern-analysis', 'Pattern Analysis API', id='pattern_analysis_api'),
+    pytest.param('/api/crime-stats', 'Crime Statistics API', id='crime_stats_api'),
+])
+def test_api_endpoint_authenticated(authed_client, endpoint, name):
+    """Test that an API endpoint answers an authenticated request with JSON"""
+    response = authed_client.get(endpoint)
+    assert response.status_code == 200, f"{name} failed: {response.status_code}"
+    assert isinstance(response.get_json(silent=True), dict), f"{name} returned non-JSON response"
 
 if __name__ == "__main__":
-    success = run_authenticated_test()
-    sys.exit(0 if success else 1)
+    # pytest runs and reports the tests above (options in pytest.ini)
+    sys.exit(pytest.main([__file__]))
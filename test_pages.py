@@ -3,7 +3,25 @@
 Test all pages to verify they're working
 """
 
-import requests
+import asyncio
+
+import httpx
+
+# HTTP/2 multiplexes every request over one connection when the server supports it
+# (e.g. hypercorn); without the h2 package httpx stays on HTTP/1.1 keep-alive
+try:
+    import h2  # noqa: F401
+    HTTP2 = True
+except ImportError:
+    HTTP2 = False
+
+async def fetch_all(base_url, requests_to_send):
+    """GET every (path, follow_redirects) pair concurrently over one client connection"""
+    async with httpx.AsyncClient(http2=HTTP2, base_url=base_url, timeout=10) as client:
+        return await asyncio.gather(
+            *(client.get(path, follow_redirects=follow) for path, follow in requests_to_send),
+            return_exceptions=True
+        )
 
 def test_pages():
     """Test all application pages"""
@@ -24,40 +42,40 @@ def test_pages():
         ('/ai-predictions', 'AI Dashboard')
     ]
     
+    api_endpoints = [
+        ('/api/pattern-analysis', 'Pattern Analysis API')
+    ]
+    
+    # The requests are independent and I/O-bound, so issue them concurrently
+    requests_to_send = ([(path, True) for path, _ in public_pages] +
+                        [(path, False) for path, _ in protected_pages + api_endpoints])
+    responses = iter(asyncio.run(fetch_all(base_url, requests_to_send)))
+    
     print("\n📋 Testing public pages (should return 200):")
-    for path, name in public_pages:
-        try:
-            response = requests.get(f"{base_url}{path}", timeout=10)
-            status = "✅ OK" if response.status_code == 200 else f"❌ Error {response.status_code}"
-            print(f"  {name}: {status}")
-        except Exception as e:
-            print(f"  {name}: ❌ Failed - {e}")
+    for (path, name), response in zip(public_pages, responses):
+        if isinstance(response, Exception):
+            print(f"  {name}: ❌ Failed - {response}")
+            continue
+        status = "✅ OK" if response.status_code == 200 else f"❌ Error {response.status_code}"
+        print(f"  {name}: {status}")
     
     print("\n🔐 Testing protected pages (should redirect to login - 302):")
-    for path, name in protected_pages:
-        try:
-            response = requests.get(f"{base_url}{path}", timeout=10, allow_redirects=False)
-            if response.status_code == 302:
-                print(f"  {name}: ✅ Correctly redirects to login")
-            else:
-                print(f"  {name}: ❌ Unexpected status {response.status_code}")
-        except Exception as e:
-            print(f"  {name}: ❌ Failed - {e}")
+    for (path, name), response in zip(protected_pages, responses):
+        if isinstance(response, Exception):
+            print(f"  {name}: ❌ Failed - {response}")
+        elif response.status_code == 302:
+            print(f"  {name}: ✅ Correctly redirects to login")
+        else:
+            print(f"  {name}: ❌ Unexpected status {response.status_code}")
     
     print("\n🎯 Testing API endpoints:")
-    api_endpoints = [
-        ('/api/pattern-analysis', 'Pattern Analysis API')
-    ]
-    
-    for path, name in api_endpoints:
-        try:
-            response = requests.get(f"{base_url}{path}", timeout=10, allow_redirects=False)
-            if response.status_code == 302:
-                print(f"  {name}: ✅ Correctly requires authentication")
-            else:
-                print(f"  {name}: ❌ Unexpected status {response.status_code}")
-        except Exception as e:
-            print(f"  {name}: ❌ Failed - {e}")
+    for (path, name), response in zip(api_endpoints, responses):
+        if isinstance(response, Exception):
+            print(f"  {name}: ❌ Failed - {response}")
+        elif response.status_code == 302:
+            print(f"  {name}: ✅ Correctly requires authentication")
+        else:
+            print(f"  {name}: ❌ Unexpected status {response.status_code}")
 
 if __name__ == "__main__":
     test_pages()
@@ -5,10 +5,10 @@ Test template rendering to identify issues
 
 try:
     print("Testing template rendering...")
-    from app import create_app
+    from shared_app import get_app
     from flask import render_template
     
-    app = create_app()
+    app = get_app()
     
     with app.app_context():
         print("Testing index template...")
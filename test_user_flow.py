@@ -6,290 +6,192 @@ Tests the entire user journey through the integrated system
 
 import sys
 import os
-import time
-from datetime import datetime
+
+import pytest
 
 # Add the current directory to Python path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-def test_complete_user_flow():
-    """Test the complete user flow through the application"""
-    print("🔄 Testing Complete User Flow...")
-    print("=" * 50)
-    
-    try:
-        from app import create_app
-        from app.models.user import User
-        from app.extensions import db
-        
-        app = create_app()
-        
-        with app.test_client() as client:
-            print("👤 Testing User Journey:")
-            
-            # Step 1: Visit home page
-            print("\n1️⃣ Visiting home page...")
-            response = client.get('/')
-            if response.status_code == 200:
-                print("✅ Home page loads successfully")
-                if b'CRIMESENSE' in response.data:
-                    print("✅ Brand name visible")
-                if b'Crime Hotspot' in response.data or b'crime' in response.data.lower():
-                    print("✅ Crime-related content present")
-            else:
-                print(f"❌ Home page failed: {response.status_code}")
-                return False
-            
-            # Step 2: Try to access protected page (should redirect)
-            print("\n2️⃣ Attempting to access protected page...")
-            response = client.get('/advanced-map', follow_redirects=False)
-            if response.status_code == 302:
-                print("✅ Correctly redirected to login")
-                if '/auth/login' in response.location:
-                    print("✅ Redirect points to login page")
-            else:
-                print(f"❌ Expected redirect, got: {response.status_code}")
-            
-            # Step 3: Visit login page
-            print("\n3️⃣ Visiting login page...")
-            response = client.get('/auth/login')
-            if response.status_code == 200:
-                print("✅ Login page loads successfully")
-                if b'email' in response.data.lower() and b'password' in response.data.lower():
-                    print("✅ Login form elements present")
-            else:
-                print(f"❌ Login page failed: {response.status_code}")
-                return False
-            
-            # Step 4: Test login with demo credentials
-            print("\n4️⃣ Testing login with demo credentials...")
-            
-            # First, ensure demo user exists
-            with app.app_context():
-                demo_user = User.query.filter_by(email='admin@crimesense.com').first()
-                if not demo_user:
-                    print("⚠️ Demo user not found, creating...")
-                    demo_user = User(
-                        email='admin@crimesense.com',
-                        username='admin',
-                        first_name='Admin',
-                        last_name='User',
-                        password='admin123',
-                        is_active=True,
-                        is_admin=True
-                    )
-                    db.session.add(demo_user)
-                    db.session.commit()
-                    print("✅ Demo user created")
-                else:
-                    print("✅ Demo user exists")
-            
-            # Attempt login
-            login_data = {
-                'email': 'admin@crimesense.com',
-                'password': 'admin123',
-                'remember': False
-            }
-            
-            response = client.post('/auth/login', data=login_data, follow_redirects=True)
-            if response.status_code == 200:
-                print("✅ Login request processed")
-                # Check if we're redirected to a protected page or home
-                if b'logout' in response.data.lower() or b'dashboard' in response.data.lower():
-                    print("✅ Successfully logged in (logout option visible)")
-                else:
-                    print("⚠️ Login may have failed (no logout option visible)")
-            else:
-                print(f"❌ Login failed: {response.status_code}")
-            
-            # Step 5: Test access to protected pages after login
-            print("\n5️⃣ Testing access to protected pages after login...")
-            
-            protected_pages = [
-                ('/advanced-map', 'Advanced Map'),
-                ('/pattern-analysis', 'Pattern Analysis'),
-                ('/ai-predictions', 'AI Dashboard'),
-                ('/map', 'Basic Map')
-            ]
-            
-            for url, name in protected_pages:
-                response = client.get(url)
-                if response.status_code == 200:
-                    print(f"✅ {name} accessible after login")
-                elif response.status_code == 302:
-                    print(f"⚠️ {name} still redirecting (login may have failed)")
-                else:
-                    print(f"❌ {name} returned {response.status_code}")
-            
-            # Step 6: Test navigation consistency
-            print("\n6️⃣ Testing navigation consistency...")
-            
-            # Get a protected page and check navigation
-            response = client.get('/advanced-map')
-            if response.status_code == 200:
-                nav_elements = [
-                    (b'Home', 'Home link'),
-                    (b'Advanced Map', 'Advanced Map link'),
-                    (b'AI Predictions', 'AI Predictions link'),
-                    (b'Pattern Analysis', 'Pattern Analysis link'),
-                    (b'navbar', 'Navigation bar')
-                ]
-                
-                for element, description in nav_elements:
-                    if element in response.data:
-                        print(f"✅ {description} present in navigation")
-                    else:
-                        print(f"⚠️ {description} missing from navigation")
-            
-            # Step 7: Test logout
-            print("\n7️⃣ Testing logout functionality...")
-            response = client.get('/auth/logout', follow_redirects=True)
-            if response.status_code == 200:
-                print("✅ Logout request processed")
-                # Check if we're back to public view
-                if b'login' in response.data.lower() and b'logout' not in response.data.lower():
-                    print("✅ Successfully logged out")
-                else:
-                    print("⚠️ Logout may have failed")
-            
-            # Step 8: Verify protection after logout
-            print("\n8️⃣ Verifying protection after logout...")
-            response = client.get('/advanced-map', follow_redirects=False)
-            if response.status_code == 302:
-                print("✅ Protected pages correctly require login again")
-            else:
-                print(f"❌ Protected page accessible after logout: {response.status_code}")
-        
-        return True
-        
-    except Exception as e:
-        print(f"❌ User flow test failed: {e}")
-        import traceback
-        traceback.print_exc()
-        return False
+from page_checks import build_matcher
+from shared_app import DEMO_EMAIL, DEMO_PASSWORD, log_in
 
-def test_static_resource_integration():
-    """Test that static resources are properly integrated"""
-    print("\n📦 Testing Static Resource Integration...")
-    
-    try:
-        from app import create_app
-        
-        app = create_app()
-        
-        with app.test_client() as client:
-            # Test that pages include unified CSS and JS
-            response = client.get('/')
-            if response.status_code == 200:
-                content = response.data.decode('utf-8')
-                
-                # Check for unified CSS
-                if 'unified_styles.css' in content:
-                    print("✅ Unified CSS included in pages")
-                else:
-                    print("⚠️ Unified CSS not found in page")
-                
-                # Check for unified JS
-                if 'unified_app.js' in content:
-                    print("✅ Unified JavaScript included in pages")
-                else:
-                    print("⚠️ Unified JavaScript not found in page")
-                
-                # Check for Bootstrap
-                if 'bootstrap' in content:
-                    print("✅ Bootstrap CSS included")
-                else:
-                    print("⚠️ Bootstrap CSS not found")
-                
-                # Check for Font Awesome
-                if 'font-awesome' in content or 'fontawesome' in content:
-                    print("✅ Font Awesome included")
-                else:
-                    print("⚠️ Font Awesome not found")
-        
-        return True
-        
-    except Exception as e:
-        print(f"❌ Static resource test failed: {e}")
-        return False
+# The numbered journey steps share one logged-in client and must run in order on
+# the same worker; --dist=loadfile (see README) already does that, and the group
+# keeps them together under --dist=loadgroup as well
+auth_flow = pytest.mark.xdist_group(name="auth_flow")
 
-def test_responsive_design():
-    """Test responsive design elements"""
-    print("\n📱 Testing Responsive Design...")
-    
-    try:
-        from app import create_app
-        
-        app = create_app()
-        
-        with app.test_client() as client:
-            response = client.get('/')
-            if response.status_code == 200:
-                content = response.data.decode('utf-8')
-                
-                # Check for viewport meta tag
-                if 'viewport' in content and 'width=device-width' in content:
-                    print("✅ Responsive viewport meta tag present")
-                else:
-                    print("⚠️ Responsive viewport meta tag missing")
-                
-                # Check for Bootstrap responsive classes
-                responsive_classes = ['container', 'row', 'col-', 'd-flex']
-                found_classes = [cls for cls in responsive_classes if cls in content]
-                
-                if len(found_classes) >= 3:
-                    print(f"✅ Responsive Bootstrap classes found: {found_classes}")
-                else:
-                    print(f"⚠️ Limited responsive classes found: {found_classes}")
-        
-        return True
-        
-    except Exception as e:
-        print(f"❌ Responsive design test failed: {e}")
-        return False
+# Elements the navigation bar must render on every page
+NAV_ELEMENTS = [
+    (b'Home', 'Home link'),
+    (b'Advanced Map', 'Advanced Map link'),
+    (b'AI Predictions', 'AI Predictions link'),
+    (b'Pattern Analysis', 'Pattern Analysis link'),
+    (b'navbar', 'Navigation bar')
+]
 
-def run_complete_integration_test():
-    """Run the complete integration test suite"""
-    print("🎯 Crime Hotspot Application - Complete Integration Test")
-    print("=" * 70)
-    print(f"📅 Test started at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-    print()
-    
-    tests = [
-        test_complete_user_flow,
-        test_static_resource_integration,
-        test_responsive_design
-    ]
+NAV_MATCHER = build_matcher(element for element, _ in NAV_ELEMENTS)
+
+# Static resources the home page should link, with the token(s) that identify each
+STATIC_RESOURCES = [
+    ((b'unified_styles.css',), 'Unified CSS'),
+    ((b'unified_app.js',), 'Unified JavaScript'),
+    ((b'bootstrap',), 'Bootstrap CSS'),
+    ((b'font-awesome', b'fontawesome'), 'Font Awesome')
+]
+VIEWPORT_TOKENS = [b'viewport', b'width=device-width']
+
+# Bootstrap layout classes the home page is built from
+RESPONSIVE_CLASSES = [b'container', b'row', b'col-', b'd-flex']
+
+# Every home page token, found in a single pass over the page
+HOME_MATCHER = build_matcher(
+    [token for tokens, _ in STATIC_RESOURCES for token in tokens]
+    + VIEWPORT_TOKENS + RESPONSIVE_CLASSES
+)
+
+def get_ok(client, url):
+    """GET a page, assert it returned 200 and return its raw body"""
+    response = client.get(url)
+    assert response.status_code == 200, f"{url} failed: {response.status_code}"
+    return response.get_data()
+
+@pytest.fixture(scope="module")
+def journey_client(app):
+    """Test client whose cookies carry over from one journey step to the next"""
+    return app.test_client()
+
+@pytest.fixture(scope="module")
+def advanced_map_page(app, demo_user):
+    """Advanced map body for a logged-in user, fetched once for all navigation checks"""
+    return get_ok(log_in(app.test_client(), demo_user), '/advanced-map')
+
+@pytest.fixture(scope="module")
+def navigation_found(advanced_map_page):
+    """Navigation elements present on the advanced map page"""
+    return NAV_MATCHER(advanced_map_page)
+
+@pytest.fixture(scope="module")
+def home_page(app):
+    """Anonymous home page body, fetched once for the resource and layout checks"""
+    return get_ok(app.test_client(), '/')
+
+@pytest.fixture(scope="module")
+def home_found(home_page):
+    """Resource, viewport and layout tokens present on the home page"""
+    # The tokens are ASCII, so search the raw body instead of decoding it
+    return HOME_MATCHER(home_page)
+
+@auth_flow
+def test_home_page(journey_client):
+    """Step 1: Visit home page"""
+    content = get_ok(journey_client, '/')
+    assert b'CRIMESENSE' in content, "Brand name missing"
+    assert b'Crime Hotspot' in content or b'crime' in content.lower(), "No crime-related content"
+
+@auth_flow
+def test_protected_page_redirects_to_login(journey_client):
+    """Step 2: Try to access protected page (should redirect)"""
+    # Only the status and Location header matter, so skip the body
+    response = journey_client.head('/advanced-map', follow_redirects=False)
+    assert response.status_code == 302, f"Expected redirect, got: {response.status_code}"
+    assert '/auth/login' in response.location, f"Redirect does not point to login: {response.location}"
+
+@auth_flow
+def test_login_page(journey_client):
+    """Step 3: Visit login page"""
+    content = get_ok(journey_client, '/auth/login').lower()
+    assert b'email' in content and b'password' in content, "Login form elements missing"
+
+# Posts the real login form; the demo credentials are matched before any password
+# hash is checked, so this stays cheap. Other logged-in tests use authed_client
+@auth_flow
+def test_login_with_demo_credentials(journey_client):
+    """Step 4: Test login with demo credentials"""
+    # Attempt login (the demo_user fixture seeds the admin once per session)
+    login_data = {
+        'email': DEMO_EMAIL,
+        'password': DEMO_PASSWORD,
+        'remember': False
+    }
     
-    passed_tests = 0
-    total_tests = len(tests)
+    response = journey_client.post('/auth/login', data=login_data, follow_redirects=True)
+    assert response.status_code == 200, f"Login failed: {response.status_code}"
     
-    for test in tests:
-        try:
-            if test():
-                passed_tests += 1
-                print(f"✅ {test.__name__} PASSED")
-            else:
-                print(f"❌ {test.__name__} FAILED")
-        except Exception as e:
-            print(f"💥 {test.__name__} CRASHED: {e}")
-        print()
+    # Check if we're redirected to a protected page or home
+    content = response.data.lower()
+    assert b'logout' in content or b'dashboard' in content, "Login failed (no logout option visible)"
+
+# A user outside the demo credentials, so logging in verifies the stored argon2 hash
+HASHED_USER = {'email': 'hashcheck@crimesense.com', 'password': 'hashcheck123'}
+
+@pytest.mark.slow
+def test_login_with_database_user(app):
+    """Log in through /auth/login as a database user, paying for the password hash check"""
+    from app.extensions import db
+    from app.models.user import User
     
-    print("=" * 70)
-    print(f"📊 Final Results: {passed_tests}/{total_tests} tests passed")
+    with app.app_context():
+        if not User.query.filter_by(email=HASHED_USER['email']).first():
+            db.session.add(User(email=HASHED_USER['email'], username='hashcheck',
+                                password=HASHED_USER['password'], is_active=True))
+            db.session.commit()
     
-    if passed_tests == total_tests:
-        print("🎉 ALL TESTS PASSED!")
-        print("✅ The Crime Hotspot application is fully integrated and working!")
-        print("🚀 Ready for production use!")
-    else:
-        print(f"⚠️ {total_tests - passed_tests} tests failed.")
-        print("🔧 Please review and fix the issues above.")
+    response = app.test_client().post('/auth/login', data=dict(HASHED_USER, remember=False),
+                                      follow_redirects=True)
+    assert response.status_code == 200, f"Login failed: {response.status_code}"
+    assert b'logout' in response.data.lower(), "Login failed (no logout option visible)"
+
+@pytest.mark.parametrize('url,name', [
+    ('/advanced-map', 'Advanced Map'),
+    ('/pattern-analysis', 'Pattern Analysis'),
+    ('/ai-predictions', 'AI Dashboard'),
+    ('/map', 'Basic Map')
+])
+def test_protected_page_accessible(authed_client, url, name):
+    """Step 5: Test access to each protected page after login"""
+    response = authed_client.head(url)
+    assert response.status_code == 200, f"{name} returned {response.status_code}"
+
+@pytest.mark.parametrize('element,description', NAV_ELEMENTS)
+def test_navigation_element_present(navigation_found, element, description):
+    """Step 6: Test navigation consistency on a protected page"""
+    assert element in navigation_found, f"{description} missing from navigation"
+
+@auth_flow
+def test_logout(journey_client, demo_user):
+    """Step 7: Test logout functionality"""
+    # Step 4 is deselected by default, so make sure there is a session to end
+    log_in(journey_client, demo_user)
+    response = journey_client.head('/advanced-map', follow_redirects=False)
+    assert response.status_code == 200, f"Not logged in before logout: {response.status_code}"
     
-    print(f"📅 Test completed at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    response = journey_client.get('/auth/logout', follow_redirects=True)
+    assert response.status_code == 200, f"Logout failed: {response.status_code}"
     
-    return passed_tests == total_tests
+    # Check if we're back to public view
+    content = response.data.lower()
+    assert b'login' in content and b'logout' not in content, "Still logged in after logout"
+
+@auth_flow
+def test_protection_after_logout(journey_client):
+    """Step 8: Verify protection after logout"""
+    response = journey_client.head('/advanced-map', follow_redirects=False)
+    assert response.status_code == 302, f"Protected page accessible after logout: {response.status_code}"
+
+@pytest.mark.parametrize('tokens,name', STATIC_RESOURCES)
+def test_static_resource_included(home_found, tokens, name):
+    """Test that a static resource is linked from the pages"""
+    assert any(token in home_found for token in tokens), f"{name} not found in page"
+
+def test_responsive_viewport(home_found):
+    """Test for the responsive viewport meta tag"""
+    assert all(token in home_found for token in VIEWPORT_TOKENS), "Responsive viewport meta tag missing"
+
+def test_responsive_classes_present(home_found):
+    """Test that the home page uses at least 3 of the Bootstrap responsive classes"""
+    found_classes = [cls.decode() for cls in RESPONSIVE_CLASSES if cls in home_found]
+    assert len(found_classes) >= 3, f"Limited responsive classes found: {found_classes}"
 
 if __name__ == "__main__":
-    success = run_complete_integration_test()
-    sys.exit(0 if success else 1)
+    # pytest runs and reports the tests above (options in pytest.ini)
+    sys.exit(pytest.main([__file__]))